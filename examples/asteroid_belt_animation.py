@@ -102,17 +102,16 @@ def main():
     true_anomaly = rng.uniform(0, 2 * np.pi, size=N)
 
     # m = 0.0 if we assume asteroids are massless
-    for i in range(N):
-        system.add_keplerian(
-            semi_major_axis=a[i],
-            eccentricity=ecc[i],
-            inclination=inc[i],
-            argument_of_periapsis=argument_of_periapsis[i],
-            longitude_of_ascending_node=long_asc_node[i],
-            true_anomaly=true_anomaly[i],
-            m=0.0,
-            primary_object_index=0,
-        )
+    system.add_keplerian(
+        semi_major_axis=a,
+        eccentricity=ecc,
+        inclination=inc,
+        argument_of_periapsis=argument_of_periapsis,
+        longitude_of_ascending_node=long_asc_node,
+        true_anomaly=true_anomaly,
+        m=0.0,
+        primary_object_index=0,
+    )
 
     system.center_of_mass_correction()
     print("Done!")
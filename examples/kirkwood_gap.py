@@ -16,12 +16,9 @@ Note: 1. N = 1000 is enough to observe some gaps, but it may not be very clear.
 Warning: Do not run multiple instances of this program at the same time, unless you made copies
          of the whole directory. Otherwise, the final data may overwrite each other.
 
-TODO: Calculations for the 2D scatter plot is not vectorized and is extremely slow.
-
 Author: Ching Yin Ng
 """
 
-import csv
 from pathlib import Path
 import sys
 
@@ -59,7 +56,6 @@ def main():
 
     massive_objects_count = system.objects_count
     inner_objects_count = 2
-    outer_objects_count = 2
 
     rng = np.random.default_rng()
     a = rng.uniform(2.0, 3.35, size=N)
@@ -69,17 +65,16 @@ def main():
     long_asc_node = rng.uniform(0, 2 * np.pi, size=N)
     true_anomaly = rng.uniform(0, 2 * np.pi, size=N)
 
-    for i in range(N):
-        system.add_keplerian(
-            semi_major_axis=a[i],
-            eccentricity=ecc[i],
-            inclination=inc[i],
-            argument_of_periapsis=argument_of_periapsis[i],
-            longitude_of_ascending_node=long_asc_node[i],
-            true_anomaly=true_anomaly[i],
-            m=0.0,
-            primary_object_index=0,
-        )
+    system.add_keplerian(
+        semi_major_axis=a,
+        eccentricity=ecc,
+        inclination=inc,
+        argument_of_periapsis=argument_of_periapsis,
+        longitude_of_ascending_node=long_asc_node,
+        true_anomaly=true_anomaly,
+        m=0.0,
+        primary_object_index=0,
+    )
     system.sort_by_distance(primary_object_index=0)
     system.center_of_mass_correction()
     system.name = f"kirkwood_gap_N{N}"
@@ -115,69 +110,48 @@ def main():
     save_count_semi_major_axes = 0
     save_count_visualization = 0
 
-    # Increase the field size limit to read the data
-    new_field_lim = sys.maxsize
-    while True:
-        try:
-            csv.field_size_limit(new_field_lim)
-            break
-        except OverflowError:
-            new_field_lim = new_field_lim // 10
-
     with open(data_path, "r") as file:
-        reader = csv.reader(file)
-
         data_size = int(tf // dt // storing_freq) + 1
-        file.seek(0)
         progress_bar = Progress_bar()
 
+        # Both kinds of frames are drawn in a single pass over the data,
+        # so that the data file is only read and parsed once
         print()
-        print("Drawing frames for semi-major-axes plots...")
+        print("Drawing frames for semi-major-axes and visualization plots...")
         fig1, ax1 = plt.subplots()
         ax1_xlim_min = 1.8
         ax1_xlim_max = 3.5
         ax1_ylim_min = 0.0
         ax1_ylim_max = 1.0
+        fig2, ax2 = plt.subplots(figsize=(4.8, 4.8))
+        ax2.set_facecolor("black")
+        ax2_xlim_min = -3.5
+        ax2_xlim_max = 3.5
+        ax2_ylim_min = -3.5
+        ax2_ylim_max = 3.5
         with progress_bar:
             if data_size is not None:
                 task = progress_bar.add_task("", total=data_size)
 
-            for row in reader:
-                if len(row) == 0 or row[0].startswith("#"):
+            for line in file:
+                if line.isspace() or line.startswith("#"):
                     continue
 
-                year = grav_sim.days_to_years(float(row[0])) / 1e6
-                row = row[3:]
-                row = list(map(float, row))
-
-                # fmt: off
-
-                # Due to removal of asteroids by Kepler auto clear,
-                # we need to count the number of asteroids every row
-                asteroids_count = int(len(row) // 6) - massive_objects_count
-                sun_x = np.array(row[:3])
-                sun_v = np.array(
-                    row[(inner_objects_count + asteroids_count + outer_objects_count) * 3 
-                        : ( inner_objects_count + asteroids_count + outer_objects_count) * 3 + 3
-                    ]
-                )
-                asteroids_x = (
-                    np.array(
-                        row[(inner_objects_count * 3) 
-                            : (inner_objects_count + asteroids_count) * 3
-                        ]
-                    ).reshape(asteroids_count, 3)
-                )
-                asteroids_v = (
-                    np.array(
-                        row[inner_objects_count * 6 + (asteroids_count + outer_objects_count) * 3
-                            : (inner_objects_count + asteroids_count) * 6 + outer_objects_count * 3
-                        ]
-                    ).reshape(asteroids_count, 3)
+                # Parse the numbers of the line directly into a float array,
+                # instead of splitting it into a list of strings first
+                row = np.fromstring(line, dtype=np.float64, sep=",")
+                year = grav_sim.days_to_years(row[0]) / 1e6
+                sun_x, sun_v, asteroids_x, asteroids_v = parse_state(
+                    row, massive_objects_count, inner_objects_count
                 )
 
-                eccentricity = calculate_eccentricity(asteroids_x - sun_x, asteroids_v - sun_v, 0.0, G, M)
-                semi_major_axes = calculate_semi_major_axis(asteroids_x - sun_x, asteroids_v - sun_v, 0.0, G, M)
+                # Heliocentric states, shared by the calculations of both plots
+                helio_x = asteroids_x - sun_x
+                helio_v = asteroids_v - sun_v
+
+                # fmt: off
+                eccentricity = calculate_eccentricity(helio_x, helio_v, 0.0, G, M)
+                semi_major_axes = calculate_semi_major_axis(helio_x, helio_v, 0.0, G, M)
                 # fmt: on
 
                 # Scatter plot
@@ -226,80 +200,16 @@ def main():
                 fig1.tight_layout()
 
                 # Capture the frame
-                plt.savefig(file_path / f"semi_major_axes_frames_{save_count_semi_major_axes:04d}.png", dpi=DPI)
+                fig1.savefig(file_path / f"semi_major_axes_frames_{save_count_semi_major_axes:04d}.png", dpi=DPI)
                 save_count_semi_major_axes += 1
 
                 # Clear the plot to prepare for the next frame
                 ax1.clear()
 
-                if data_size is not None:
-                    progress_bar.update(task, completed=save_count_semi_major_axes)
                 # fmt: on
 
-        progress_bar.stop_task(task)
-        plt.close("all")
-        file.seek(0)
-
-        print()
-        print("Drawing frames for visualization plots...")
-        fig2, ax2 = plt.subplots(figsize=(4.8, 4.8))
-        ax2.set_facecolor("black")
-        ax2_xlim_min = -3.5
-        ax2_xlim_max = 3.5
-        ax2_ylim_min = -3.5
-        ax2_ylim_max = 3.5
-        with progress_bar:
-            if data_size is not None:
-                task = progress_bar.add_task("", total=data_size)
-
-            for row in reader:
-                if len(row) == 0 or row[0].startswith("#"):
-                    continue
-
-                year = grav_sim.days_to_years(float(row[0])) / 1e6
-                row = row[3:]
-                row = list(map(float, row))
-
                 # fmt: off
-
-                # Due to removal of asteroids by Kepler auto clear,
-                # we need to count the number of asteroids every row
-                asteroids_count = int(len(row) // 6) - massive_objects_count
-
-                sun_x = np.array(row[:3])
-                sun_v = np.array(
-                    row[(inner_objects_count + asteroids_count + outer_objects_count) * 3 
-                        : ( inner_objects_count + asteroids_count + outer_objects_count) * 3 + 3
-                    ]
-                )
-                asteroids_x = (
-                    np.array(
-                        row[(inner_objects_count * 3) 
-                            : (inner_objects_count + asteroids_count) * 3
-                        ]
-                    ).reshape(asteroids_count, 3)
-                )
-                asteroids_v = (
-                    np.array(
-                        row[inner_objects_count * 6 + (asteroids_count + outer_objects_count) * 3
-                            : (inner_objects_count + asteroids_count) * 6 + outer_objects_count * 3
-                        ]
-                    ).reshape(asteroids_count, 3)
-                )
-
-                x = np.zeros((asteroids_count, 3))
-                for i in range(asteroids_count):
-                    semi_major_axis, _, true_anomaly, _, arg_per, long_asc_nodes = cartesian_to_orbital_elements(
-                        0.0, M, asteroids_x[i] - sun_x, asteroids_v[i] - sun_v, G=G
-                    )
-                    x[i] = keplerian_to_cartesian(
-                        semi_major_axis=semi_major_axis,
-                        eccentricity=0.0,
-                        inclination=0.0,
-                        argument_of_periapsis=arg_per,
-                        longitude_of_ascending_node=long_asc_nodes,
-                        true_anomaly=true_anomaly,
-                    )
+                x = calculate_corrected_positions(helio_x, helio_v, 0.0, G, M)
 
                 # Plotting the sun
                 ax2.plot(
@@ -348,7 +258,7 @@ def main():
                 fig2.tight_layout()
 
                 # Capture the frame
-                plt.savefig(
+                fig2.savefig(
                     file_path
                     / f"visualization_frames_{save_count_visualization:04d}.png",
                     dpi=DPI,
@@ -412,6 +322,22 @@ def main():
     print("Done! Exiting the program...")
 
 
+def parse_state(row, massive_objects_count, inner_objects_count):
+    """Parse the state of the sun and the asteroids from a row of the data
+
+    The positions and velocities are returned as views of the row.
+    Since asteroids are removed by Kepler auto remove, the number of
+    asteroids is counted every row.
+    """
+    state = row[3:].reshape(2, -1, 3)
+    x = state[0]
+    v = state[1]
+    asteroids_count = x.shape[0] - massive_objects_count
+    asteroids_slice = slice(inner_objects_count, inner_objects_count + asteroids_count)
+
+    return x[0], v[0], x[asteroids_slice], v[asteroids_slice]
+
+
 def calculate_eccentricity(x, v, m, G, M):
     ecc_vec = (
         np.cross(v, np.cross(x, v)) / (G * (m + M))
@@ -423,202 +349,61 @@ def calculate_eccentricity(x, v, m, G, M):
 
 
 def calculate_semi_major_axis(x, v, m, G, M):
-    E_sp = 0.5 * np.linalg.norm(v, axis=1) ** 2 - G * (m + M) / np.linalg.norm(
-        x, axis=1
-    )
+    # Squared speed directly, instead of squaring the norm
+    E_sp = 0.5 * np.einsum("ij,ij->i", v, v) - G * (m + M) / np.linalg.norm(x, axis=1)
     a = -0.5 * G * (m + M) / E_sp
 
     return a
 
 
-def cartesian_to_orbital_elements(
-    mp,
-    ms,
-    position,
-    velocity,
-    G,
-):
-    """
-
-    Function that computes orbital elements from cartesian coordinates.
-    Return values are: mass1, mass2, semimajor axis, eccentricity,
-    true anomaly, inclination, longitude of the ascending nodes and the
-    argument of pericenter. All angles are returned in radians.
-    In case of a perfectly circular orbit the true anomaly
-    and argument of pericenter cannot be determined; in this case, the
-    return values are 0.0 for both angles.
-
-    Reference: copied from ABIE with slight modification
-    https://github.com/MovingPlanetsAround/ABIE/blob/master/abie/tools.py
-    """
-
-    total_mass = mp + ms
-
-    ### specific energy ###
-    v_sq = np.dot(velocity, velocity)
-    r_sq = np.dot(position, position)
-    r = np.sqrt(r_sq)
-
-    specific_energy = (1.0 / 2.0) * v_sq - G * total_mass / r
-    # if specific_energy >= 0.0:
-    #     print 'Not a bound orbit!'
-
-    semimajor_axis = -G * total_mass / (2.0 * specific_energy)
-
-    ### specific angular momentum ###
-    specific_angular_momentum = np.cross(position, velocity)
-    specific_angular_momentum_norm = np.sqrt(
-        np.dot(specific_angular_momentum, specific_angular_momentum)
-    )
-    specific_angular_momentum_unit = (
-        specific_angular_momentum / specific_angular_momentum_norm
-    )
-
-    maximum_specific_angular_momentum_norm = (
-        G * total_mass / (np.sqrt(-2.0 * specific_energy))
-    )
-    ell = (
-        specific_angular_momentum_norm / maximum_specific_angular_momentum_norm
-    )  ### specific AM in units of maximum AM
-
-    ### for e = 0 or e nearly 0, ell can be slightly larger than unity due to numerical reasons ###
-    ell_epsilon = 1e-15
-
-    completely_or_nearly_circular = False
-
-    if ell > 1.0:
-        if 1.0 < ell <= ell + ell_epsilon:  ### still unity within numerical precision
-            print(
-                "orbit is completely or nearly circular; in this case the LRL vector cannot be used to reliably obtain the argument of pericenter and true anomaly; the output values of the latter will be set to zero; output e will be e = 0"
-            )
-            ell = 1.0
-            completely_or_nearly_circular = True
-        else:  ### larger than unity within numerical precision
-            raise Exception(
-                "angular momentum larger than maximum angular momentum for bound orbit"
-            )
-
-    eccentricity = np.sqrt(1.0 - ell**2)
-
-    ### Orbital inclination ###
-    z_vector = np.array([0.0, 0.0, 1.0])
-    inclination = np.arccos(np.dot(z_vector, specific_angular_momentum_unit))
-
-    ### Longitude of ascending nodes, with reference direction along x-axis ###
-    ascending_node_vector = np.cross(z_vector, specific_angular_momentum)
-    ascending_node_vector_norm = np.sqrt(
-        np.dot(ascending_node_vector, ascending_node_vector)
-    )
-    if ascending_node_vector_norm == 0:
-        ascending_node_vector_unit = np.array([1.0, 0.0, 0.0])
-    else:
-        ascending_node_vector_unit = ascending_node_vector / ascending_node_vector_norm
-
-    long_asc_nodes = np.arctan2(
-        ascending_node_vector_unit[1], ascending_node_vector_unit[0]
-    )
-
-    ### Argument of periapsis and true anomaly, using eccentricity a.k.a. Laplace-Runge-Lenz (LRL) vector ###
-    mu = G * total_mass
-    position_unit = position / r
-    e_vector = (1.0 / mu) * np.cross(
-        velocity, specific_angular_momentum
-    ) - position_unit  ### Laplace-Runge-Lenz vector
-
-    if completely_or_nearly_circular:  ### orbit is completely or nearly circular; in this case the LRL vector cannot be used to reliably obtain the argument of pericenter and true anomaly; the output values of the latter will be set to zero; output e will be e = 0
-        arg_per = 0.0
-        true_anomaly = 0.0
-    else:
-        e_vector_norm = np.sqrt(np.dot(e_vector, e_vector))
-        e_vector_unit = e_vector / e_vector_norm
-
-    e_vector_unit_cross_AM_unit = np.cross(
-        e_vector_unit, specific_angular_momentum_unit
-    )
-    sin_arg_per = np.dot(ascending_node_vector_unit, e_vector_unit_cross_AM_unit)
-    cos_arg_per = np.dot(e_vector_unit, ascending_node_vector_unit)
-    arg_per = np.arctan2(sin_arg_per, cos_arg_per)
-
-    sin_true_anomaly = np.dot(position_unit, -1.0 * e_vector_unit_cross_AM_unit)
-    cos_true_anomaly = np.dot(position_unit, e_vector_unit)
-    true_anomaly = np.arctan2(sin_true_anomaly, cos_true_anomaly)
-
-    return (
-        semimajor_axis,
-        eccentricity,
-        true_anomaly,
-        inclination,
-        arg_per,
-        long_asc_nodes,
-    )
-
-
-def keplerian_to_cartesian(
-    semi_major_axis: float,
-    eccentricity: float,
-    inclination: float,
-    argument_of_periapsis: float,
-    longitude_of_ascending_node: float,
-    true_anomaly: float,
-):
-    """
-    Convert keplerian elements to cartesian coordinates,
-    modified to calculate position only.
+def calculate_corrected_positions(x, v, m, G, M):
+    """Positions on circular orbits in the xy-plane with the same
+    semi-major axes and true longitudes as the given orbits
 
-    Reference
-    ---------
-    Moving Planets Around: An Introduction to N-Body
-    Simulations Applied to Exoplanetary Systems, Chapter 2
+    With zero eccentricity and inclination, the position reduces to
+    a * (cos(l), sin(l), 0), where l is the sum of the longitude of
+    ascending node, argument of periapsis and true anomaly. This is
+    computed for all objects at once instead of one object at a time.
     """
-
-    cos_inc = np.cos(inclination)
-    sin_inc = np.sin(inclination)
-
-    cos_arg_periapsis = np.cos(argument_of_periapsis)
-    sin_arg_periapsis = np.sin(argument_of_periapsis)
-
-    cos_long_asc_node = np.cos(longitude_of_ascending_node)
-    sin_long_asc_node = np.sin(longitude_of_ascending_node)
-
-    cos_true_anomaly = np.cos(true_anomaly)
-    sin_true_anomaly = np.sin(true_anomaly)
-
-    # ecc_unit_vec is the unit vector pointing towards periapsis
-    ecc_unit_vec = np.zeros(3)
-    ecc_unit_vec[0] = (
-        cos_long_asc_node * cos_arg_periapsis
-        - sin_long_asc_node * sin_arg_periapsis * cos_inc
-    )
-    ecc_unit_vec[1] = (
-        sin_long_asc_node * cos_arg_periapsis
-        + cos_long_asc_node * sin_arg_periapsis * cos_inc
-    )
-    ecc_unit_vec[2] = sin_arg_periapsis * sin_inc
-
-    # q_unit_vec is the unit vector that is perpendicular to ecc_unit_vec and orbital angular momentum vector
-    q_unit_vec = np.zeros(3)
-    q_unit_vec[0] = (
-        -cos_long_asc_node * sin_arg_periapsis
-        - sin_long_asc_node * cos_arg_periapsis * cos_inc
-    )
-    q_unit_vec[1] = (
-        -sin_long_asc_node * sin_arg_periapsis
-        + cos_long_asc_node * cos_arg_periapsis * cos_inc
+    mu = G * (m + M)
+    r = np.linalg.norm(x, axis=1)
+    x_unit = x / r[:, np.newaxis]
+    a = calculate_semi_major_axis(x, v, m, G, M)
+
+    # Unit vector of the specific angular momentum
+    h = np.cross(x, v)
+    h_unit = h / np.linalg.norm(h, axis=1)[:, np.newaxis]
+
+    # Unit vector of the ascending node, with reference direction along x-axis
+    n = np.zeros_like(h)
+    n[:, 0] = -h[:, 1]
+    n[:, 1] = h[:, 0]
+    n_norm = np.linalg.norm(n, axis=1)
+    n_unit = np.zeros_like(n)
+    n_unit[:, 0] = 1.0
+    is_inclined = n_norm != 0.0
+    n_unit[is_inclined] = n[is_inclined] / n_norm[is_inclined, np.newaxis]
+    long_asc_node = np.arctan2(n_unit[:, 1], n_unit[:, 0])
+
+    # Argument of periapsis and true anomaly, using the eccentricity vector
+    ecc_vec = np.cross(v, h) / mu - x_unit
+    ecc_unit = ecc_vec / np.linalg.norm(ecc_vec, axis=1)[:, np.newaxis]
+    ecc_unit_cross_h_unit = np.cross(ecc_unit, h_unit)
+    arg_periapsis = np.arctan2(
+        np.einsum("ij,ij->i", n_unit, ecc_unit_cross_h_unit),
+        np.einsum("ij,ij->i", ecc_unit, n_unit),
     )
-    q_unit_vec[2] = cos_arg_periapsis * sin_inc
-
-    # Calculate the position vector
-    x = (
-        semi_major_axis
-        * (1.0 - eccentricity**2)
-        / (1.0 + eccentricity * cos_true_anomaly)
-        * (cos_true_anomaly * ecc_unit_vec + sin_true_anomaly * q_unit_vec)
+    true_anomaly = np.arctan2(
+        -np.einsum("ij,ij->i", x_unit, ecc_unit_cross_h_unit),
+        np.einsum("ij,ij->i", x_unit, ecc_unit),
     )
 
-    if np.isnan(x).any():
-        return np.array([np.nan, np.nan, np.nan])
+    true_longitude = long_asc_node + arg_periapsis + true_anomaly
+    corrected_x = np.zeros_like(x)
+    corrected_x[:, 0] = a * np.cos(true_longitude)
+    corrected_x[:, 1] = a * np.sin(true_longitude)
 
-    return x
+    return corrected_x
 
 
 if __name__ == "__main__":
@@ -10,13 +10,10 @@ Author:  Ching Yin Ng
 
 import copy
 import ctypes
-import sys
 import warnings
 from pathlib import Path
 from typing import Optional, Tuple
 
-sys.path.append(str(Path(__file__).parent))
-
 import numpy as np
 
 from . import plotting
@@ -28,6 +25,22 @@ from .simulator import Simulator
 class GravitySimulatorAPI:
     """Gravity simulator API"""
 
+    # The constants and plotting functions are shared class attributes,
+    # instead of being bound again on every instance
+    BUILT_IN_SYSTEMS = Simulator.RECOMMENDED_SETTINGS_BUILT_IN_SYSTEMS.keys()
+    AVAILABLE_INTEGRATORS = Simulator.AVAILABLE_INTEGRATORS
+    AVAILABLE_ACCELERATION_METHODS = Simulator.AVAILABLE_ACCELERATION_METHODS
+    AVAILABLE_STORING_METHODS = Simulator.AVAILABLE_STORING_METHODS
+
+    plot_2d_trajectory = staticmethod(plotting.plot_2d_trajectory)
+    plot_3d_trajectory = staticmethod(plotting.plot_3d_trajectory)
+    animate_2d_traj_gif = staticmethod(plotting.animate_2d_traj_gif)
+    animate_3d_traj_gif = staticmethod(plotting.animate_3d_traj_gif)
+    plot_quantity_against_time = staticmethod(plotting.plot_quantity_against_time)
+    plot_eccentricity_or_inclination = staticmethod(
+        plotting.plot_eccentricity_or_inclination
+    )
+
     def __init__(self, c_lib_path: Optional[str] = None) -> None:
         """
         Initialize gravity simulator API
@@ -45,24 +58,6 @@ class GravitySimulatorAPI:
 
         self.simulator = Simulator(self.c_lib)
 
-        self.plot_2d_trajectory = plotting.plot_2d_trajectory
-        self.plot_3d_trajectory = plotting.plot_3d_trajectory
-        self.animate_2d_traj_gif = plotting.animate_2d_traj_gif
-        self.animate_3d_traj_gif = plotting.animate_3d_traj_gif
-        self.plot_quantity_against_time = plotting.plot_quantity_against_time
-        self.plot_eccentricity_or_inclination = (
-            plotting.plot_eccentricity_or_inclination
-        )
-
-        self.BUILT_IN_SYSTEMS = (
-            self.simulator.RECOMMENDED_SETTINGS_BUILT_IN_SYSTEMS.keys()
-        )
-        self.AVAILABLE_INTEGRATORS = self.simulator.AVAILABLE_INTEGRATORS
-        self.AVAILABLE_ACCELERATION_METHODS = (
-            self.simulator.AVAILABLE_ACCELERATION_METHODS
-        )
-        self.AVAILABLE_STORING_METHODS = self.simulator.AVAILABLE_STORING_METHODS
-
     def days_to_years(self, days: float | np.ndarray) -> float | np.ndarray:
         return days / self.simulator.DAYS_PER_YEAR
 
@@ -227,7 +222,12 @@ class GravitySimulatorAPI:
             "order",
             "opening_angle",
         ]
-        storing_params_list = ["storing_method", "storing_freq", "flush_path"]
+        storing_params_list = [
+            "storing_method",
+            "storing_freq",
+            "flush_path",
+            "memmap_path",
+        ]
         settings_list = [
             "disable_progress_bar",
             "make_copy_params",
@@ -495,6 +495,18 @@ class GravitySimulatorAPI:
                 warnings.warn(
                     'storing_params["flush_path"] is not used for default storing method'
                 )
+        if "memmap_path" in storing_params:
+            if storing_params["method"] != "default":
+                warnings.warn(
+                    'storing_params["memmap_path"] is only used for default storing method'
+                )
+            if not (
+                isinstance(storing_params["memmap_path"], str)
+                or isinstance(storing_params["memmap_path"], Path)
+            ):
+                raise TypeError(
+                    f"Expected str or Path, but got {type(storing_params['memmap_path'])}"
+                )
         if storing_params["method"] == "flush":
             if "flush_path" not in storing_params:
                 raise ValueError(
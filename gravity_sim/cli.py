@@ -34,34 +34,51 @@ class GravitySimulatorCLI:
         "solar_system",
         "solar_system_plus",
     ]
-    SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS = {
-        "sun_earth_moon": ["Sun", "Earth", "Moon"],
-        "solar_system": [
-            "Sun",
-            "Mercury",
-            "Venus",
-            "Earth",
-            "Mars",
-            "Jupiter",
-            "Saturn",
-            "Uranus",
-            "Neptune",
-        ],
-        "solar_system_plus": [
-            "Sun",
-            "Mercury",
-            "Venus",
-            "Earth",
-            "Mars",
-            "Jupiter",
-            "Saturn",
-            "Uranus",
-            "Neptune",
-            "Pluto",
-            "Ceres",
-            "Vesta",
-        ],
+    SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS = GravitationalSystem.SOLAR_LIKE_SYSTEMS
+    # Colors of the objects in the solar-like systems, computed once
+    # instead of being looked up by every plotting function
+    SOLAR_LIKE_SYSTEM_COLORS = {
+        system_name: [plotting.SOLAR_SYSTEM_COLORS.get(name) for name in objects_names]
+        for system_name, objects_names in GravitationalSystem.SOLAR_LIKE_SYSTEMS.items()
     }
+    # Patterns for parsing user input, compiled once
+    # instead of on every prompt and matched against the whole input
+    TIME_INPUT_PATTERN = re.compile(
+        r"\s*([+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+))\s*(days?|years?|yr|d|y)?\s*",
+        re.IGNORECASE,
+    )
+    BOOL_INPUT_PATTERN = re.compile(r"\s*(yes|no|y|n)\s*", re.IGNORECASE)
+    # Menus of the selection prompts, joined once instead of
+    # being rebuilt line by line every time the user retries
+    SYSTEMS_MENU = (
+        "Select a system:\n"
+        + "".join(
+            f"{i + 1}. {system}\n" for i, system in enumerate(C_LIB_BUILT_IN_SYSTEMS)
+        )
+        + "Enter system number (int): "
+    )
+    INTEGRATORS_MENU = (
+        "Choose an integrator:\n"
+        + "".join(
+            f"{i + 1}. {integrator}\n"
+            for i, integrator in enumerate(Simulator.AVAILABLE_INTEGRATORS)
+        )
+        + "Enter integrator number (int): "
+    )
+
+    # Wrappers of the plotting actions 1 to 9 after simulation, looked up
+    # by index instead of matching the action number case by case
+    PLOTTING_ACTIONS = (
+        "_plot_2d_trajectory_wrapper",
+        "_plot_3d_trajectory_wrapper",
+        "_animate_2d_trajectory_wrapper",
+        "_animate_3d_trajectory_wrapper",
+        "_plot_rel_energy_error_wrapper",
+        "_plot_rel_angular_momentum_error_wrapper",
+        "_plot_dt_wrapper",
+        "_plot_eccentricity_wrapper",
+        "_plot_inclination_wrapper",
+    )
 
     def __init__(self) -> None:
         ### Read command line arguments ###
@@ -70,10 +87,13 @@ class GravitySimulatorCLI:
         if args.c_lib_path is not None:
             self.c_lib_path = Path(args.c_lib_path)
         self.is_exit_ctypes_bool = ctypes.c_bool(False)
+        # The results folder is only created when something is saved to it
         self.default_results_folder = Path(__file__).parent / "results"
-        self.default_results_folder.mkdir(exist_ok=True, parents=True)
 
-        self.has_data_attr: list[str] = []
+        # Names of the data attributes that are currently set. A set is
+        # used since it is mostly checked for membership, and adding the
+        # same name again (e.g. when retrying input) is a no-op
+        self.has_data_attr: set[str] = set()
 
     def run_prog(self) -> None:
         try:
@@ -224,25 +244,11 @@ class GravitySimulatorCLI:
             action = self.get_int(msg, larger_than=0, smaller_than=15)
             print()
 
+            if action <= len(self.PLOTTING_ACTIONS):
+                getattr(self, self.PLOTTING_ACTIONS[action - 1])()
+                continue
+
             match action:
-                case 1:
-                    self._plot_2d_trajectory_wrapper()
-                case 2:
-                    self._plot_3d_trajectory_wrapper()
-                case 3:
-                    self._animate_2d_trajectory_wrapper()
-                case 4:
-                    self._animate_3d_trajectory_wrapper()
-                case 5:
-                    self._plot_rel_energy_error_wrapper()
-                case 6:
-                    self._plot_rel_angular_momentum_error_wrapper()
-                case 7:
-                    self._plot_dt_wrapper()
-                case 8:
-                    self._plot_eccentricity_wrapper()
-                case 9:
-                    self._plot_inclination_wrapper()
                 case 10:
                     print(f"There are {self.data_size_} lines of data.")
                     print()
@@ -303,20 +309,19 @@ class GravitySimulatorCLI:
         self.sol_dt_ = self.simulator.sol_dt_
         self.data_size_ = self.simulator.data_size_
 
-        self.has_data_attr.append("gravitational_system")
-        self.has_data_attr.append("sol_state_")
-        self.has_data_attr.append("sol_time_")
-        self.has_data_attr.append("sol_dt_")
-        self.has_data_attr.append("data_size_")
+        self.has_data_attr.add("gravitational_system")
+        self.has_data_attr.add("sol_state_")
+        self.has_data_attr.add("sol_time_")
+        self.has_data_attr.add("sol_dt_")
+        self.has_data_attr.add("data_size_")
 
         return False
 
     def _delete_previous_simulation_data(self) -> None:
-        attr_list_copy = self.has_data_attr.copy()
-        for attr in attr_list_copy:
+        for attr in self.has_data_attr:
             if hasattr(self, attr):
                 delattr(self, attr)
-            self.has_data_attr.remove(attr)
+        self.has_data_attr.clear()
 
     def _get_user_simulation_input(
         self,
@@ -359,12 +364,10 @@ class GravitySimulatorCLI:
         }
 
         ### Select system ###
-        msg = "Select a system:\n"
-        for i, system in enumerate(self.C_LIB_BUILT_IN_SYSTEMS):
-            msg += f"{i + 1}. {system}\n"
-        msg += "Enter system number (int): "
         system_number = self.get_int(
-            msg, larger_than=0, smaller_than=len(self.C_LIB_BUILT_IN_SYSTEMS) + 1
+            self.SYSTEMS_MENU,
+            larger_than=0,
+            smaller_than=len(self.C_LIB_BUILT_IN_SYSTEMS) + 1,
         )
         system_name = self.C_LIB_BUILT_IN_SYSTEMS[system_number - 1]
         print()
@@ -388,12 +391,8 @@ class GravitySimulatorCLI:
         if not try_recommended_settings:
             print()
             ### Integrator parameters ###
-            msg = "Choose an integrator:\n"
-            for i, integrator in enumerate(self.simulator.AVAILABLE_INTEGRATORS):
-                msg += f"{i + 1}. {integrator}\n"
-            msg += "Enter integrator number (int): "
             integrator_number = self.get_int(
-                msg,
+                self.INTEGRATORS_MENU,
                 larger_than=0,
                 smaller_than=len(self.simulator.AVAILABLE_INTEGRATORS) + 1,
             )
@@ -405,35 +404,11 @@ class GravitySimulatorCLI:
             ### Input tf ###
             # tf = 0 is allowed as user may want to plot the
             # initial position of the system
-            while True:
-                user_input_tf = input("Enter tf (days/year) (e.g. 200y or 100d): ")
-                if matches := re.search(
-                    r"([0-9]*\.?[0-9]*)(?:\.|\W*)*(day|year|d|y)?",
-                    user_input_tf,
-                    re.IGNORECASE,
-                ):
-                    if not matches.group(1):
-                        print("Invalid input. Please try again.")
-                        print()
-                        continue
-
-                    try:
-                        tf = float(matches.group(1))
-                        if tf < 0:
-                            raise ValueError
-                    except ValueError:
-                        print("Invalid input. Please try again.")
-                        print()
-                        continue
-
-                    break
-            if matches.group(2) in ["year", "y"]:
-                self.tf_units = "years"
-                tf *= self.simulator.DAYS_PER_YEAR
-            else:
-                self.tf_units = "days"
+            tf, self.tf_units = self.get_time(
+                "Enter tf (days/year) (e.g. 200y or 100d): ", allow_zero=True
+            )
 
-            self.has_data_attr.append("tf_units")
+            self.has_data_attr.add("tf_units")
             print()
 
             ### Input dt / tolerance ###
@@ -441,36 +416,11 @@ class GravitySimulatorCLI:
                 integrator_params["integrator"]
                 in self.simulator.FIXED_STEP_SIZE_INTEGRATORS
             ):
-                while True:
-                    user_input_dt = input("Enter dt (days/year) (e.g. 1d): ")
-                    if matches := re.search(
-                        r"([0-9]*\.?[0-9]*)(?:\.|\W*)*(day|year|d|y)?\s*",
-                        user_input_dt,
-                        re.IGNORECASE,
-                    ):
-                        if not matches.group(1):
-                            print("Invalid input. Please try again.")
-                            print()
-                            continue
-
-                        try:
-                            dt = float(matches.group(1))
-                            if dt <= 0:
-                                raise ValueError
-                        except ValueError:
-                            print("Invalid input. Please try again.")
-                            print()
-                            continue
-
-                        break
-
-                if matches.group(2) in ["year", "y"]:
-                    self.dt_units = "years"
-                    dt *= self.simulator.DAYS_PER_YEAR
-                else:
-                    self.dt_units = "days"
+                dt, self.dt_units = self.get_time(
+                    "Enter dt (days/year) (e.g. 1d): ", allow_zero=False
+                )
 
-                self.has_data_attr.append("dt_units")
+                self.has_data_attr.add("dt_units")
 
                 integrator_params["dt"] = dt
                 integrator_params["tolerance"] = 0.0
@@ -534,13 +484,47 @@ class GravitySimulatorCLI:
         ### Estimate number of data points for fixed step size integrators ###
         if integrator_params["dt"] != 0.0:
             n_steps = int(tf / integrator_params["dt"])
-            sol_size = int(n_steps / storing_params["storing_freq"] + 1)
+            sol_size = n_steps // storing_params["storing_freq"] + 1
             print(f"Estimated number of data points: {sol_size}")
 
         print()
 
-    @staticmethod
-    def get_bool(msg: str) -> bool:
+    @classmethod
+    def get_time(cls, msg: str, allow_zero: bool) -> tuple[float, str]:
+        """Prompt user for a non-negative time with optional units
+
+        Parameters
+        ----------
+        msg : str
+            Message to display to user
+        allow_zero : bool
+            Flag to check whether zero is accepted
+
+        Returns
+        -------
+        time : float
+            User input time in days
+        units : str
+            Units entered by the user, either "days" or "years"
+
+        Notes
+        -----
+        This function has following side effects:
+        - Print msg
+        - Print "Invalid input. Please try again." if user enters an invalid input
+        """
+        while True:
+            if matches := cls.TIME_INPUT_PATTERN.fullmatch(input(msg)):
+                time = float(matches.group(1))
+                if time > 0.0 or (allow_zero and time == 0.0):
+                    if matches.group(2) is not None and matches.group(2)[0] in "yY":
+                        return time * Simulator.DAYS_PER_YEAR, "years"
+                    return time, "days"
+
+            print("Invalid input. Please try again.\n")
+
+    @classmethod
+    def get_bool(cls, msg: str) -> bool:
         """Prompt user for boolean input
 
         Parameters
@@ -559,11 +543,10 @@ class GravitySimulatorCLI:
         - Print "Invalid input. Please try again." if user enters an invalid input
         """
         while True:
-            if matches := re.search(r"^\s*(yes|no|y|n)\s*$", input(msg), re.IGNORECASE):
-                if matches.group(1).lower() in ["y", "yes"]:
-                    return True
-                elif matches.group(1).lower() in ["n", "no"]:
-                    return False
+            # The pattern only matches y, yes, n or no (case-insensitive),
+            # so the first letter is enough to tell the answer
+            if matches := cls.BOOL_INPUT_PATTERN.fullmatch(input(msg)):
+                return matches.group(1)[0] in "yY"
 
             print("Invalid input. Please try again.\n")
 
@@ -690,20 +673,92 @@ class GravitySimulatorCLI:
 
         raise ValueError("User canceled input")
 
+    def _compute_data_attr(self, attr: str) -> bool:
+        """Compute a quantity from the solution state on first use
+
+        The result is stored as a data attribute, so later plots and
+        saves reuse it, and trimming the data also trims it.
+
+        Parameters
+        ----------
+        attr : str
+            Name of the data attribute, one of "sol_energy_",
+            "sol_angular_momentum_", "sol_eccentricity_" and
+            "sol_inclination_"
+
+        Returns
+        -------
+        bool
+            True if the data is available, False otherwise
+        """
+        if attr in self.has_data_attr:
+            return True
+
+        quantity_name = attr.removeprefix("sol_").removesuffix("_").replace("_", " ")
+        if "gravitational_system" not in self.has_data_attr:
+            print(
+                f"Error: unable to compute {quantity_name} without gravitational system data."
+            )
+            print()
+            return False
+
+        system = self.gravitational_system
+        if attr == "sol_energy_":
+            data = self.simulator.compute_energy(
+                system.objects_count,
+                system.m,
+                system.G,
+                self.sol_state_,
+                self.is_exit_ctypes_bool,
+            )
+        elif attr == "sol_angular_momentum_":
+            data = self.simulator.compute_angular_momentum(
+                system.objects_count,
+                system.m,
+                self.sol_state_,
+                self.is_exit_ctypes_bool,
+            )
+        elif attr == "sol_eccentricity_":
+            data = self.simulator.compute_eccentricity(
+                system.objects_count,
+                system.m,
+                system.G,
+                self.sol_state_,
+            )
+        elif attr == "sol_inclination_":
+            data = self.simulator.compute_inclination(
+                system.objects_count,
+                self.sol_state_,
+            )
+        else:
+            raise ValueError(f"Unknown data attribute: {attr}")
+
+        setattr(self, attr, data)
+        self.has_data_attr.add(attr)
+        return True
+
+    def _get_save_fig_path(self, prefix: str) -> Path:
+        """Get the first unused path of the form {prefix}_00000.pdf
+
+        The results folder is listed once, instead of checking
+        the existence of every candidate file one by one.
+        """
+        self.default_results_folder.mkdir(exist_ok=True, parents=True)
+        existing_files = {
+            path.name for path in self.default_results_folder.glob(f"{prefix}_*.pdf")
+        }
+        i = 0
+        while f"{prefix}_{i:05d}.pdf" in existing_files:
+            i += 1
+
+        return self.default_results_folder / f"{prefix}_{i:05d}.pdf"
+
     def _plot_2d_trajectory_wrapper(self) -> None:
         # Get kwargs
         kwargs: dict[str, Any] = {}
         kwargs["sol_state"] = self.sol_state_
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder / f"2d_trajectory_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("2d_trajectory")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -712,19 +767,10 @@ class GravitySimulatorCLI:
             print("Plotting 2D trajectory (xy plane)...(Please check the window)")
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ]
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name]
                 kwargs["legend"] = True
 
         # Plot 2D trajectory
@@ -741,15 +787,7 @@ class GravitySimulatorCLI:
         kwargs: dict[str, Any] = {}
         kwargs["sol_state"] = self.sol_state_
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder / f"3d_trajectory_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("3d_trajectory")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -758,19 +796,10 @@ class GravitySimulatorCLI:
             print("Plotting 3D trajectory...(Please check the window)")
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels: list[str] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ]
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name]
                 kwargs["legend"] = True
 
         # Plot 3D trajectory
@@ -806,7 +835,7 @@ class GravitySimulatorCLI:
 
             plotting_freq = int(self.data_size_ / (desired_time * fps))
             print(f"Plotting frequency: {plotting_freq}")
-            frame_size = int(self.data_size_ / plotting_freq) + 1
+            frame_size = self.data_size_ // plotting_freq + 1
             print(f"Estimated time length: {(frame_size / fps):.1f} s")
             print()
 
@@ -909,19 +938,10 @@ class GravitySimulatorCLI:
         }
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ]
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name]
                 kwargs["legend"] = True
 
         print("Animating 2D trajectory (xy plane) in .gif...")
@@ -957,19 +977,10 @@ class GravitySimulatorCLI:
         }
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ]
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name]
                 kwargs["legend"] = True
 
         print("Animating 3D trajectory (xy plane) in .gif...")
@@ -1000,13 +1011,7 @@ class GravitySimulatorCLI:
         kwargs["ylabel"] = f"dt ({self.dt_units})"
 
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = self.default_results_folder / f"dt_plot_{i:05d}.pdf"
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("dt_plot")
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
 
@@ -1024,19 +1029,8 @@ class GravitySimulatorCLI:
         print("------------------------------------")
 
     def _plot_rel_energy_error_wrapper(self) -> None:
-        if "sol_energy_" not in self.has_data_attr:
-            if "gravitational_system" in self.has_data_attr:
-                self.sol_energy_ = self.simulator.compute_energy(
-                    self.gravitational_system.objects_count,
-                    self.gravitational_system.m,
-                    self.gravitational_system.G,
-                    self.sol_state_,
-                    self.is_exit_ctypes_bool,
-                )
-                self.has_data_attr.append("sol_energy_")
-            else:
-                "Error: unable to compute energy without gravitational system data."
-                return
+        if not self._compute_data_attr("sol_energy_"):
+            return
 
         if self.sol_energy_[0] == 0.0:
             print(
@@ -1062,15 +1056,7 @@ class GravitySimulatorCLI:
         kwargs["ylabel"] = "$|(E(t)-E_0)/E_0|$"
 
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder / f"rel_energy_error_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("rel_energy_error")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -1089,18 +1075,8 @@ class GravitySimulatorCLI:
         print("------------------------------------")
 
     def _plot_rel_angular_momentum_error_wrapper(self) -> None:
-        if "sol_angular_momentum_" not in self.has_data_attr:
-            if "gravitational_system" in self.has_data_attr:
-                self.sol_angular_momentum_ = self.simulator.compute_angular_momentum(
-                    self.gravitational_system.objects_count,
-                    self.gravitational_system.m,
-                    self.sol_state_,
-                    self.is_exit_ctypes_bool,
-                )
-                self.has_data_attr.append("sol_angular_momentum_")
-            else:
-                "Error: unable to compute angular momentum without gravitational system data."
-                return
+        if not self._compute_data_attr("sol_angular_momentum_"):
+            return
 
         if self.sol_angular_momentum_[0] == 0.0:
             print(
@@ -1127,16 +1103,7 @@ class GravitySimulatorCLI:
         kwargs["ylabel"] = "$|(L(t)-L_0)/L_0|$"
 
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder
-                    / f"rel_angular_momentum_error_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("rel_angular_momentum_error")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -1157,20 +1124,8 @@ class GravitySimulatorCLI:
         print("------------------------------------")
 
     def _plot_eccentricity_wrapper(self) -> None:
-        if "sol_eccentricity_" not in self.has_data_attr:
-            if "gravitational_system" in self.has_data_attr:
-                self.sol_eccentricity_ = self.simulator.compute_eccentricity(
-                    self.gravitational_system.objects_count,
-                    self.gravitational_system.m,
-                    self.gravitational_system.G,
-                    self.sol_state_,
-                )
-                self.has_data_attr.append("sol_eccentricity_")
-            else:
-                print(
-                    "Error: unable to compute eccentricity without gravitational system data."
-                )
-                return
+        if not self._compute_data_attr("sol_eccentricity_"):
+            return
 
         # Get kwargs
         kwargs: dict[str, Any] = {}
@@ -1185,31 +1140,15 @@ class GravitySimulatorCLI:
         kwargs["ylabel"] = "Eccentricity"
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels: list[str] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ][1:]  # Exclude the first object)
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                # Exclude the first object
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name][1:]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name][1:]
                 kwargs["legend"] = True
 
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder / f"plot_eccentricity_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("plot_eccentricity")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -1228,18 +1167,8 @@ class GravitySimulatorCLI:
         print("------------------------------------")
 
     def _plot_inclination_wrapper(self) -> None:
-        if "sol_inclination_" not in self.has_data_attr:
-            if "gravitational_system" in self.has_data_attr:
-                self.sol_inclination_ = self.simulator.compute_inclination(
-                    self.gravitational_system.objects_count,
-                    self.sol_state_,
-                )
-                self.has_data_attr.append("sol_inclination_")
-            else:
-                print(
-                    "Error: unable to compute inclination without gravitational system data."
-                )
-                return
+        if not self._compute_data_attr("sol_inclination_"):
+            return
 
         # Get kwargs
         kwargs: dict[str, Any] = {}
@@ -1254,31 +1183,15 @@ class GravitySimulatorCLI:
         kwargs["ylabel"] = "Inclination"
 
         if "gravitational_system" in self.has_data_attr:
-            if self.gravitational_system.name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
-                labels: list[str] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[
-                    self.gravitational_system.name
-                ][1:]  # Exclude the first object)
-                colors: list[str] = []
-                for label in labels:
-                    if label in plotting.SOLAR_SYSTEM_COLORS:
-                        color = plotting.SOLAR_SYSTEM_COLORS[label]
-                        if color is not None:
-                            colors.append(color)
-
-                kwargs["colors"] = colors
-                kwargs["labels"] = labels
+            system_name = self.gravitational_system.name
+            if system_name in self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS:
+                # Exclude the first object
+                kwargs["colors"] = self.SOLAR_LIKE_SYSTEM_COLORS[system_name][1:]
+                kwargs["labels"] = self.SOLAR_LIKE_SYSTEM_OBJECTS_PAIRS[system_name][1:]
                 kwargs["legend"] = True
 
         if self.is_save_plots:
-            i = 0
-            while True:
-                save_fig_path = (
-                    self.default_results_folder / f"plot_inclination_{i:05d}.pdf"
-                )
-                if save_fig_path.exists():
-                    i += 1
-                else:
-                    break
+            save_fig_path = self._get_save_fig_path("plot_inclination")
 
             kwargs["save_fig"] = True
             kwargs["save_fig_path"] = save_fig_path
@@ -1308,10 +1221,8 @@ class GravitySimulatorCLI:
                     allow_cancel=True,
                 )
 
-                trim_freq = int(
-                    (self.data_size_ + desired_trim_size - 1) / desired_trim_size
-                )
-                trim_size = int(self.data_size_ / trim_freq)
+                trim_freq = -(-self.data_size_ // desired_trim_size)
+                trim_size = utils.trim_data(self.data_size_, trim_freq)
                 if self.get_bool(
                     f"The trimmed data size would be {trim_size}. Continue? (y/n): "
                 ):
@@ -1346,14 +1257,7 @@ class GravitySimulatorCLI:
         if "sol_energy_" not in self.has_data_attr:
             if "gravitational_system" in self.has_data_attr:
                 if self.get_bool("Energy data not available. Compute energy? (y/n): "):
-                    self.sol_energy_ = self.simulator.compute_energy(
-                        self.gravitational_system.objects_count,
-                        self.gravitational_system.m,
-                        self.gravitational_system.G,
-                        self.sol_state_,
-                        self.is_exit_ctypes_bool,
-                    )
-                    self.has_data_attr.append("sol_energy_")
+                    self._compute_data_attr("sol_energy_")
                 else:
                     if not self.get_bool("Proceed saving without energy data? (y/n): "):
                         return
@@ -1363,11 +1267,10 @@ class GravitySimulatorCLI:
                 ):
                     return
 
-        if hasattr(self, "sol_energy_"):
-            energy_data = self.sol_energy_
-        else:
-            energy_data = np.zeros(self.data_size_)
+        # Without energy data, zeros are written in the energy column
+        energy_data = getattr(self, "sol_energy_", None)
 
+        self.default_results_folder.mkdir(exist_ok=True, parents=True)
         results_file_path = self.default_results_folder / (
             str(datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")) + "_result.csv"
         )
@@ -1406,6 +1309,13 @@ class GravitySimulatorCLI:
         self.sol_energy_ = results_dict["energy"]
         self.sol_state_ = results_dict["state"]
         self.data_size_ = len(self.sol_state_)
+        # The results files are saved in days
+        self.tf_units = "days"
+        self.dt_units = "days"
+        self.has_data_attr.update(
+            ["sol_time_", "sol_dt_", "sol_energy_", "sol_state_", "data_size_"]
+        )
+        self.has_data_attr.update(["tf_units", "dt_units"])
 
         print("Done!")
         print("------------------------------------")
@@ -4,7 +4,6 @@ Gravitational System class to represent a system of celestial bodies
 Author: Ching Yin Ng
 """
 
-import csv
 from pathlib import Path
 from typing import Optional
 
@@ -13,8 +12,22 @@ import numpy as np
 from . import plotting
 from . import utils
 
+# Default file for saving and loading customized systems, resolved once at
+# import time instead of on every save and load
+_DEFAULT_CUSTOMIZED_SYSTEMS_FILE_PATH = Path(__file__).parent / "customized_systems.csv"
+
 
 class GravitationalSystem:
+    # Only these instance attributes are allowed, which avoids
+    # a per-instance __dict__ and speeds up attribute access
+    __slots__ = ("name", "_x", "_v", "_m", "objects_count", "G")
+    name: str
+    _x: np.ndarray
+    _v: np.ndarray
+    _m: np.ndarray
+    objects_count: int
+    G: float
+
     # Conversion factor from km^3 s^-2 to AU^3 d^-2
     CONVERSION_FACTOR = (86400**2) / (149597870.7**3)
     # GM values (km^3 s^-2)
@@ -159,6 +172,49 @@ class GravitationalSystem:
         ],
     }
 
+    # Solar system data as contiguous (N, 3) / (N,) tables, built once
+    # so that loading a solar-like system is a single fancy indexing
+    _SOLAR_SYSTEM_INDEX = {name: i for i, name in enumerate(SOLAR_SYSTEM_MASSES)}
+    _SOLAR_SYSTEM_POS_TABLE = np.array(
+        list(map(SOLAR_SYSTEM_POS.__getitem__, SOLAR_SYSTEM_MASSES)), dtype=np.float64
+    )
+    _SOLAR_SYSTEM_VEL_TABLE = np.array(
+        list(map(SOLAR_SYSTEM_VEL.__getitem__, SOLAR_SYSTEM_MASSES)), dtype=np.float64
+    )
+    _SOLAR_SYSTEM_MASSES_TABLE = np.array(
+        list(SOLAR_SYSTEM_MASSES.values()), dtype=np.float64
+    )
+
+    # Objects of the built-in systems that are built from the solar system data
+    SOLAR_LIKE_SYSTEMS = {
+        "sun_earth_moon": ["Sun", "Earth", "Moon"],
+        "solar_system": [
+            "Sun",
+            "Mercury",
+            "Venus",
+            "Earth",
+            "Mars",
+            "Jupiter",
+            "Saturn",
+            "Uranus",
+            "Neptune",
+        ],
+        "solar_system_plus": [
+            "Sun",
+            "Mercury",
+            "Venus",
+            "Earth",
+            "Mars",
+            "Jupiter",
+            "Saturn",
+            "Uranus",
+            "Neptune",
+            "Pluto",
+            "Ceres",
+            "Vesta",
+        ],
+    }
+
     # Built-in systems
     BUILT_IN_SYSTEMS = [
         "circular_binary_orbit",
@@ -183,12 +239,64 @@ class GravitationalSystem:
             self.name = "Unnamed System"
         else:
             self.name = name
-        self.x = np.zeros((0, 3), dtype=np.float64)
-        self.v = np.zeros((0, 3), dtype=np.float64)
-        self.m = np.zeros((0,), dtype=np.float64)
+        # The data are stored in contiguous buffers with spare capacity,
+        # so that adding objects one by one does not reallocate every time.
+        # x, v and m are views of the first objects_count rows.
+        # x and v are kept interleaved as (N, 3), which is the layout the
+        # C library and the solution state use, so no conversion is needed.
+        self._x = np.zeros((0, 3), dtype=np.float64)
+        self._v = np.zeros((0, 3), dtype=np.float64)
+        self._m = np.zeros((0,), dtype=np.float64)
         self.objects_count = 0
         self.G = self.CONSTANT_G
 
+    @property
+    def x(self) -> np.ndarray:
+        """Position vectors of the objects"""
+        return self._x[: self.objects_count]
+
+    @x.setter
+    def x(self, x: np.ndarray) -> None:
+        # Flat (N * 3,) input is accepted and stored as (N, 3)
+        self._x = np.ascontiguousarray(x, dtype=np.float64).reshape(-1, 3)
+
+    @property
+    def v(self) -> np.ndarray:
+        """Velocity vectors of the objects"""
+        return self._v[: self.objects_count]
+
+    @v.setter
+    def v(self, v: np.ndarray) -> None:
+        # Flat (N * 3,) input is accepted and stored as (N, 3)
+        self._v = np.ascontiguousarray(v, dtype=np.float64).reshape(-1, 3)
+
+    @property
+    def m(self) -> np.ndarray:
+        """Masses of the objects"""
+        return self._m[: self.objects_count]
+
+    @m.setter
+    def m(self, m: np.ndarray) -> None:
+        self._m = np.ascontiguousarray(m, dtype=np.float64)
+
+    @staticmethod
+    def _grow_buffer(buffer: np.ndarray, new_objects_count: int) -> np.ndarray:
+        """Return a buffer with capacity of at least new_objects_count
+
+        The capacity is at least doubled, so that the total cost of
+        adding N objects one by one is O(N).
+        """
+        if buffer.shape[0] >= new_objects_count:
+            return buffer
+
+        # The capacity beyond objects_count is never read, so the new
+        # buffer does not need to be zero-initialized
+        new_capacity = max(new_objects_count, 2 * buffer.shape[0], 8)
+        new_buffer = np.empty((new_capacity,) + buffer.shape[1:], dtype=np.float64)
+        new_buffer[: buffer.shape[0]] = buffer
+
+        return new_buffer
+
     def add(
         self,
         x: list | np.ndarray,
@@ -206,50 +314,63 @@ class GravitationalSystem:
         m : float
             Mass(es) of the object(s)
         """
-        self.x = np.vstack((self.x, np.array(x, dtype=np.float64)))
-        self.v = np.vstack((self.v, np.array(v, dtype=np.float64)))
-        self.m = np.hstack((self.m, m))
+        # The values are copied into the buffers below, so the inputs
+        # are only converted (without a copy if they are already float64)
+        x = np.asarray(x, dtype=np.float64).reshape(-1, 3)
+        v = np.asarray(v, dtype=np.float64).reshape(-1, 3)
+        m = np.asarray(m, dtype=np.float64).reshape(-1)
 
-        if isinstance(m, (list, np.ndarray)):
-            self.objects_count += len(m)
-        else:
-            self.objects_count += 1
+        start = self.objects_count
+        end = start + m.shape[0]
+
+        self._x = self._grow_buffer(self._x, end)
+        self._v = self._grow_buffer(self._v, end)
+        self._m = self._grow_buffer(self._m, end)
+
+        self._x[start:end] = x
+        self._v[start:end] = v
+        self._m[start:end] = m
+
+        self.objects_count = end
 
     def add_keplerian(
         self,
-        semi_major_axis: float,
-        eccentricity: float,
-        inclination: float,
-        argument_of_periapsis: float,
-        longitude_of_ascending_node: float,
-        true_anomaly: float,
-        m: float,
+        semi_major_axis: float | np.ndarray,
+        eccentricity: float | np.ndarray,
+        inclination: float | np.ndarray,
+        argument_of_periapsis: float | np.ndarray,
+        longitude_of_ascending_node: float | np.ndarray,
+        true_anomaly: float | np.ndarray,
+        m: float | np.ndarray,
         primary_object_index: Optional[int] = None,
         primary_object_x: Optional[np.ndarray] = None,
         primary_object_v: Optional[np.ndarray] = None,
         primary_object_m: Optional[float] = None,
     ):
         """
-        Add a celestial body to the system using Keplerian elements
+        Add celestial bodies to the system using Keplerian elements
 
         Warning: This method use the G value from the system. Make sure
                  to set the correct G value before using this method.
 
+        Passing arrays of elements adds all the bodies in a single call,
+        which is much faster than calling this method in a loop.
+
         Parameters
         ----------
-        semi_major_axis : float
+        semi_major_axis : float | np.ndarray
             Semi-major axis
-        eccentricity : float
+        eccentricity : float | np.ndarray
             Eccentricity
-        inclination : float
+        inclination : float | np.ndarray
             Inclination
-        argument_of_periapsis : float
+        argument_of_periapsis : float | np.ndarray
             Argument of periapsis
-        longitude_of_ascending_node : float
+        longitude_of_ascending_node : float | np.ndarray
             Longitude of ascending node
-        true_anomaly : float
+        true_anomaly : float | np.ndarray
             True anomaly
-        m : float
+        m : float | np.ndarray
             Mass
         primary_object_index : int, optional
             Index of the primary object
@@ -311,7 +432,11 @@ class GravitationalSystem:
             total_mass=(primary_object_m + m),
             G=self.G,
         )
-        self.add(x + primary_object_x, v + primary_object_v, m)
+        self.add(
+            x + primary_object_x,
+            v + primary_object_v,
+            np.broadcast_to(m, np.shape(x)[:-1]),
+        )
 
     def remove(
         self,
@@ -345,8 +470,13 @@ class GravitationalSystem:
 
     def center_of_mass_correction(self) -> None:
         """Set center of mass of position and V_CM to zero"""
-        r_cm = np.sum(self.m[:, np.newaxis] * self.x, axis=0) / np.sum(self.m)
-        v_cm = np.sum(self.m[:, np.newaxis] * self.v, axis=0) / np.sum(self.m)
+        m = self.m
+        M = np.sum(m)
+
+        # Mass-weighted sums as matrix-vector products, which avoids
+        # creating the temporary (N, 3) arrays of m * x and m * v
+        r_cm = (m @ self.x) / M
+        v_cm = (m @ self.v) / M
 
         self.x -= r_cm
         self.v -= v_cm
@@ -383,7 +513,9 @@ class GravitationalSystem:
         - Prints a message f"System \"{self.name}\" successfully saved to \"{file_path}\""
         """
         if file_path is None:
-            file_path = Path(__file__).parent / "customized_systems.csv"
+            file_path = _DEFAULT_CUSTOMIZED_SYSTEMS_FILE_PATH
+
+        import csv
 
         with open(file_path, "a", newline="") as file:
             writer = csv.writer(file)
@@ -429,14 +561,16 @@ class GravitationalSystem:
         # Load built-in systems
         if file_path is None:
             if system_name in self.BUILT_IN_SYSTEMS:
-                if system_name == "circular_binary_orbit":
+                if system_name in self.SOLAR_LIKE_SYSTEMS:
+                    self._load_solar_like_system(self.SOLAR_LIKE_SYSTEMS[system_name])
+
+                elif system_name == "circular_binary_orbit":
                     self.G = self.CONSTANT_G
                     R1 = np.array([1.0, 0.0, 0.0])
                     R2 = np.array([-1.0, 0.0, 0.0])
                     V1 = np.array([0.0, 0.5, 0.0])
                     V2 = np.array([0.0, -0.5, 0.0])
-                    self.add(R1, V1, 1.0 / self.G)
-                    self.add(R2, V2, 1.0 / self.G)
+                    self.add([R1, R2], [V1, V2], [1.0 / self.G, 1.0 / self.G])
 
                 elif system_name == "eccentric_binary_orbit":
                     self.G = self.CONSTANT_G
@@ -444,8 +578,7 @@ class GravitationalSystem:
                     R2 = np.array([-1.25, 0.0, 0.0])
                     V1 = np.array([0.0, 0.5, 0.0])
                     V2 = np.array([0.0, -0.625, 0.0])
-                    self.add(R1, V1, 1.0 / self.G)
-                    self.add(R2, V2, 0.8 / self.G)
+                    self.add([R1, R2], [V1, V2], [1.0 / self.G, 0.8 / self.G])
 
                 elif system_name == "3d_helix":
                     self.G = self.CONSTANT_G
@@ -456,32 +589,12 @@ class GravitationalSystem:
                     V1 = np.array([-v0, 0.5, 0.0])
                     V2 = np.array([0.5 * v0, 0.5, (np.sqrt(3.0) / 2.0) * v0])
                     V3 = np.array([0.5 * v0, 0.5, -(np.sqrt(3.0) / 2.0) * v0])
-                    self.add(R1, V1, 1.0 / self.G)
-                    self.add(R2, V2, 1.0 / self.G)
-                    self.add(R3, V3, 1.0 / self.G)
-
-                elif system_name == "sun_earth_moon":
-                    self.G = self.CONSTANT_G
-                    m = np.array(
-                        [
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Sun"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Earth"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Moon"],
-                        ]
+                    self.add(
+                        [R1, R2, R3],
+                        [V1, V2, V3],
+                        [1.0 / self.G, 1.0 / self.G, 1.0 / self.G],
                     )
 
-                    R1 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Sun"])
-                    R2 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Earth"])
-                    R3 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Moon"])
-                    V1 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Sun"])
-                    V2 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Earth"])
-                    V3 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Moon"])
-                    self.add(R1, V1, m[0])
-                    self.add(R2, V2, m[1])
-                    self.add(R3, V3, m[2])
-
-                    self.center_of_mass_correction()
-
                 elif system_name == "figure-8":
                     self.G = self.CONSTANT_G
                     R1 = np.array([0.970043, -0.24308753, 0.0])
@@ -490,12 +603,11 @@ class GravitationalSystem:
                     V1 = np.array([0.466203685, 0.43236573, 0.0])
                     V2 = np.array([0.466203685, 0.43236573, 0.0])
                     V3 = np.array([-0.93240737, -0.86473146, 0.0])
-                    # x = np.array([R1, R2, R3])
-                    # v = np.array([V1, V2, V3])
-                    m = np.array([1.0 / self.G, 1.0 / self.G, 1.0 / self.G])
-                    self.add(R1, V1, 1.0 / self.G)
-                    self.add(R2, V2, 1.0 / self.G)
-                    self.add(R3, V3, 1.0 / self.G)
+                    self.add(
+                        [R1, R2, R3],
+                        [V1, V2, V3],
+                        [1.0 / self.G, 1.0 / self.G, 1.0 / self.G],
+                    )
 
                 elif system_name == "pyth-3-body":
                     self.G = self.CONSTANT_G
@@ -505,225 +617,123 @@ class GravitationalSystem:
                     V1 = np.array([0.0, 0.0, 0.0])
                     V2 = np.array([0.0, 0.0, 0.0])
                     V3 = np.array([0.0, 0.0, 0.0])
-                    self.add(R1, V1, 3.0 / self.G)
-                    self.add(R2, V2, 4.0 / self.G)
-                    self.add(R3, V3, 5.0 / self.G)
-
-                elif system_name == "solar_system":
-                    self.G = self.CONSTANT_G
-                    m = np.array(
-                        [
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Sun"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Mercury"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Venus"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Earth"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Mars"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Jupiter"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Saturn"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Uranus"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Neptune"],
-                        ]
-                    )
-
-                    R1 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Sun"])
-                    R2 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Mercury"])
-                    R3 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Venus"])
-                    R4 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Earth"])
-                    R5 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Mars"])
-                    R6 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Jupiter"])
-                    R7 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Saturn"])
-                    R8 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Uranus"])
-                    R9 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Neptune"])
-
-                    V1 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Sun"])
-                    V2 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Mercury"])
-                    V3 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Venus"])
-                    V4 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Earth"])
-                    V5 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Mars"])
-                    V6 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Jupiter"])
-                    V7 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Saturn"])
-                    V8 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Uranus"])
-                    V9 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Neptune"])
-
-                    self.add(R1, V1, m[0])
-                    self.add(R2, V2, m[1])
-                    self.add(R3, V3, m[2])
-                    self.add(R4, V4, m[3])
-                    self.add(R5, V5, m[4])
-                    self.add(R6, V6, m[5])
-                    self.add(R7, V7, m[6])
-                    self.add(R8, V8, m[7])
-                    self.add(R9, V9, m[8])
-
-                    self.center_of_mass_correction()
-
-                elif system_name == "solar_system_plus":
-                    self.G = self.CONSTANT_G
-                    m = np.array(
-                        [
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Sun"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Mercury"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Venus"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Earth"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Mars"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Jupiter"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Saturn"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Uranus"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Neptune"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Pluto"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Ceres"],
-                            GravitationalSystem.SOLAR_SYSTEM_MASSES["Vesta"],
-                        ]
+                    self.add(
+                        [R1, R2, R3],
+                        [V1, V2, V3],
+                        [3.0 / self.G, 4.0 / self.G, 5.0 / self.G],
                     )
 
-                    R1 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Sun"])
-                    R2 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Mercury"])
-                    R3 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Venus"])
-                    R4 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Earth"])
-                    R5 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Mars"])
-                    R6 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Jupiter"])
-                    R7 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Saturn"])
-                    R8 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Uranus"])
-                    R9 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Neptune"])
-                    R10 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Pluto"])
-                    R11 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Ceres"])
-                    R12 = np.array(GravitationalSystem.SOLAR_SYSTEM_POS["Vesta"])
-
-                    V1 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Sun"])
-                    V2 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Mercury"])
-                    V3 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Venus"])
-                    V4 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Earth"])
-                    V5 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Mars"])
-                    V6 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Jupiter"])
-                    V7 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Saturn"])
-                    V8 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Uranus"])
-                    V9 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Neptune"])
-                    V10 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Pluto"])
-                    V11 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Ceres"])
-                    V12 = np.array(GravitationalSystem.SOLAR_SYSTEM_VEL["Vesta"])
-
-                    self.add(R1, V1, m[0])
-                    self.add(R2, V2, m[1])
-                    self.add(R3, V3, m[2])
-                    self.add(R4, V4, m[3])
-                    self.add(R5, V5, m[4])
-                    self.add(R6, V6, m[5])
-                    self.add(R7, V7, m[6])
-                    self.add(R8, V8, m[7])
-                    self.add(R9, V9, m[8])
-                    self.add(R10, V10, m[9])
-                    self.add(R11, V11, m[10])
-                    self.add(R12, V12, m[11])
-
-                    self.center_of_mass_correction()
-
             else:
-                file_path = Path(__file__).parent / "customized_systems.csv"
-                if not file_path.is_file():
+                file_path = _DEFAULT_CUSTOMIZED_SYSTEMS_FILE_PATH
+
+                # Load system from default customized systems file. The
+                # file is opened directly instead of checking for it first,
+                # so it is only looked up once
+                try:
+                    is_loaded = self._load_customized_system(system_name, file_path)
+                except FileNotFoundError:
                     err_msg = (
                         f'load: system name "{system_name}" not found in built-in systems, and'
                         f' default customized systems file not found: "{file_path}"'
                     )
-                    raise ValueError(err_msg)
+                    raise ValueError(err_msg) from None
 
-                # Load system from default customized systems file
-                else:
-                    loaded_system_flag = False
-                    with open(file_path, "r") as file:
-                        reader = csv.reader(file)
-                        for row in reader:
-                            if row[0] == system_name:
-                                self.name = system_name
-                                self.G = float(row[1])
-                                objects_count = int(row[2])
-                                m = np.zeros(objects_count)
-                                for i in range(objects_count):
-                                    m[i] = float(row[3 + i])
-
-                                x = np.zeros((objects_count, 3))
-                                v = np.zeros((objects_count, 3))
-                                for i in range(objects_count):
-                                    x[i] = np.array(
-                                        row[
-                                            (3 + objects_count + i * 3) : (
-                                                3 + objects_count + i * 3 + 3
-                                            )
-                                        ]
-                                    )
-                                    v[i] = np.array(
-                                        row[
-                                            (
-                                                3
-                                                + objects_count
-                                                + objects_count * 3
-                                                + i * 3
-                                            ) : (
-                                                3
-                                                + objects_count
-                                                + objects_count * 3
-                                                + i * 3
-                                                + 3
-                                            )
-                                        ]
-                                    )
-
-                                self.add(x, v, m)
-                                loaded_system_flag = True
-
-                    if not loaded_system_flag:
-                        err_msg = (
-                            f'load: system name "{system_name}" not recognized in '
-                            f'built-in systems and customized systems file: "{file_path}"'
-                        )
-                        raise ValueError(err_msg)
+                if not is_loaded:
+                    err_msg = (
+                        f'load: system name "{system_name}" not recognized in '
+                        f'built-in systems and customized systems file: "{file_path}"'
+                    )
+                    raise ValueError(err_msg)
 
         # Load system from given file path
-        else:
-            loaded_system_flag = False
-            with open(file_path, "r") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if row[0] == system_name:
-                        self.name = system_name
-                        self.G = float(row[1])
-                        objects_count = int(row[2])
-                        m = np.zeros(objects_count)
-                        for i in range(objects_count):
-                            m[i] = float(row[3 + i])
-
-                        x = np.zeros((objects_count, 3))
-                        v = np.zeros((objects_count, 3))
-                        for i in range(objects_count):
-                            x[i] = np.array(
-                                row[
-                                    (3 + objects_count + i * 3) : (
-                                        3 + objects_count + i * 3 + 3
-                                    )
-                                ]
-                            )
-                            v[i] = np.array(
-                                row[
-                                    (3 + objects_count + objects_count * 3 + i * 3) : (
-                                        3
-                                        + objects_count
-                                        + objects_count * 3
-                                        + i * 3
-                                        + 3
-                                    )
-                                ]
-                            )
-
-                        self.add(x, v, m)
-                        loaded_system_flag = True
-            if not loaded_system_flag:
-                err_msg = (
-                    f'load: system name "{system_name}" not recognized in '
-                    f'given file: "{file_path}"'
-                )
-                raise ValueError(err_msg)
+        elif not self._load_customized_system(system_name, file_path):
+            err_msg = (
+                f'load: system name "{system_name}" not recognized in '
+                f'given file: "{file_path}"'
+            )
+            raise ValueError(err_msg)
 
         self.name = system_name
 
+    def _load_solar_like_system(self, objects_names: list[str]) -> None:
+        """Load a system built from the solar system data
+
+        Parameters
+        ----------
+        objects_names : list[str]
+            Names of the solar system objects to include
+
+        Notes
+        -----
+        All the objects are added at once from the precomputed tables,
+        followed by a center of mass correction.
+        """
+        self.G = self.CONSTANT_G
+        indices = [self._SOLAR_SYSTEM_INDEX[name] for name in objects_names]
+        self.add(
+            self._SOLAR_SYSTEM_POS_TABLE[indices],
+            self._SOLAR_SYSTEM_VEL_TABLE[indices],
+            self._SOLAR_SYSTEM_MASSES_TABLE[indices],
+        )
+        self.center_of_mass_correction()
+
+    def _load_customized_system(self, system_name: str, file_path: Path) -> bool:
+        """Load system from a customized systems CSV file
+
+        Parameters
+        ----------
+        system_name : str
+            Name of the system to load
+        file_path : Path
+            Path to the customized systems CSV file
+
+        Returns
+        -------
+        bool
+            True if the system is found and loaded, False otherwise
+
+        Notes
+        -----
+        The file is scanned once and only the matching row is parsed.
+        If the system was saved more than once, the last saved entry is
+        loaded.
+        """
+        import csv
+        import io
+
+        # Rows start with the system name as written by csv.writer in
+        # save(), so the lines are matched by prefix without parsing
+        # the data of the other systems
+        name_buffer = io.StringIO()
+        csv.writer(name_buffer).writerow([system_name])
+        row_prefix = name_buffer.getvalue().rstrip("\r\n") + ","
+
+        system_line = None
+        with open(file_path, "r") as file:
+            for line in file:
+                if line.startswith(row_prefix):
+                    system_line = line
+
+        if system_line is None:
+            return False
+
+        # The fields after the name are all numbers, so they are parsed
+        # directly by numpy without splitting the row into strings first
+        row_data = np.fromstring(
+            system_line[len(row_prefix) :], dtype=np.float64, sep=","
+        )
+        self.G = float(row_data[0])
+        objects_count = int(row_data[1])
+
+        # m, then x and v as (N, 3)
+        data = row_data[2 : 2 + objects_count * 7]
+        m = data[:objects_count]
+        x = data[objects_count : objects_count * 4].reshape(objects_count, 3)
+        v = data[objects_count * 4 :].reshape(objects_count, 3)
+
+        self.add(x, v, m)
+        return True
+
     def plot_2d_system(
         self,
         colors: Optional[list[str]] = None,
@@ -1,12 +1,16 @@
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-import matplotlib.pyplot as plt
-import PIL
 
 from . import utils
 
+# matplotlib and PIL are imported inside the functions that use them,
+# since importing them takes a significant part of the program startup
+# time and they are not needed unless plotting.
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 SOLAR_SYSTEM_COLORS = {
     "Sun": "orange",
     "Mercury": "slategrey",
@@ -24,7 +28,7 @@ SOLAR_SYSTEM_COLORS = {
 }
 
 
-def set_3d_axes_equal(ax: plt.Axes) -> None:
+def set_3d_axes_equal(ax: "plt.Axes") -> None:
     """
     Make axes of 3D plot have equal scale
 
@@ -58,6 +62,35 @@ def set_3d_axes_equal(ax: plt.Axes) -> None:
     ax.set_zlim3d([z_middle - plot_radius, z_middle + plot_radius])  # type: ignore
 
 
+def _get_trajectories(sol_state: np.ndarray) -> np.ndarray:
+    """
+    Rearrange the positions in the solution state by object and axis
+
+    Parameters
+    ----------
+    sol_state : np.ndarray
+        Solution state of the system
+
+    Returns
+    -------
+    trajectories : np.ndarray
+        Positions with shape (objects_count, 3, npts), where trajectories[i, j]
+        is a contiguous array of the j-th coordinate of object i over time
+
+    Notes
+    -----
+    The solution state stores all objects for each time step in a row, so
+    a single coordinate of an object is a strided column. Converting once
+    lets the plotting loops read contiguous arrays instead.
+    """
+    objects_count = sol_state.shape[1] // 6
+    return np.ascontiguousarray(
+        sol_state[:, : objects_count * 3]
+        .reshape(-1, objects_count, 3)
+        .transpose(1, 2, 0)
+    )
+
+
 def plot_2d_trajectory(
     sol_state: np.ndarray,
     colors: Optional[list[str]] = None,
@@ -96,43 +129,67 @@ def plot_2d_trajectory(
     save_fig_path : Optional[str], optional
         Path to save the figure, by default None
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
     fig = plt.figure()
     ax = fig.add_subplot(111, aspect="equal")
 
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
 
-    for i in range(sol_state.shape[1] // 6):
-        if colors is not None:
-            colors_i = colors[i]
-        else:
-            colors_i = None
-
-        if labels is not None:
-            labels_i = labels[i]
+    trajectories = _get_trajectories(sol_state)
+    objects_count = len(trajectories)
+
+    # Objects without a given color take the next color in the
+    # default color cycle, same as separate calls of ax.plot
+    default_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    default_colors_count = 0
+    objects_colors = []
+    for i in range(objects_count):
+        if colors is not None and colors[i] is not None:
+            objects_colors.append(colors[i])
         else:
-            labels_i = None
+            objects_colors.append(
+                default_colors[default_colors_count % len(default_colors)]
+            )
+            default_colors_count += 1
 
-        traj = ax.plot(
-            sol_state[:, i * 3],
-            sol_state[:, 1 + i * 3],
-            color=colors_i,
-        )
-        # Plot the last position with marker
-        ax.plot(
-            sol_state[-1, i * 3],
-            sol_state[-1, 1 + i * 3],
-            color=traj[0].get_color(),
-            label=labels_i,
-            marker=marker,
-            markersize=markersize,
+    # Draw all trajectories as one collection and all
+    # last positions as one scatter, instead of one line per object
+    ax.add_collection(
+        LineCollection(
+            list(trajectories[:, :2].transpose(0, 2, 1)), colors=objects_colors
         )
+    )
+    ax.scatter(
+        trajectories[:, 0, -1],
+        trajectories[:, 1, -1],
+        s=markersize**2,
+        c=objects_colors,
+        marker=marker,
+        zorder=2.5,
+    )
+    ax.autoscale_view()
 
     if title is not None:
         ax.set_title(title)
 
     if legend:
-        fig.legend(loc="center right", borderaxespad=0.2)
+        handles = [
+            Line2D(
+                [],
+                [],
+                color=objects_colors[i],
+                label=labels[i],
+                marker=marker,
+                markersize=markersize,
+            )
+            for i in range(objects_count)
+            if labels is not None and labels[i] is not None
+        ]
+        fig.legend(handles=handles, loc="center right", borderaxespad=0.2)
         fig.tight_layout()
 
     if save_fig:
@@ -183,6 +240,8 @@ def plot_3d_trajectory(
     save_fig_path : Optional[str], optional
         Path to save the figure, by default None
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure()
     ax = fig.add_subplot(111, projection="3d")
     ax.set_box_aspect([1.0, 1.0, 1.0])  # type: ignore
@@ -190,7 +249,8 @@ def plot_3d_trajectory(
     ax.set_ylabel(ylabel)
     ax.set_zlabel(zlabel)  # type: ignore
 
-    for i in range(sol_state.shape[1] // 6):
+    trajectories = _get_trajectories(sol_state)
+    for i in range(len(trajectories)):
         if colors is not None:
             colors_i = colors[i]
         else:
@@ -201,21 +261,16 @@ def plot_3d_trajectory(
         else:
             labels_i = None
 
-        traj = ax.plot(
-            sol_state[:, i * 3],
-            sol_state[:, i * 3 + 1],
-            sol_state[:, i * 3 + 2],
-            color=colors_i,
-        )
-        # Plot the last position with marker
+        # Plot the trajectory, with a marker at the last position only
         ax.plot(
-            sol_state[-1, i * 3],
-            sol_state[-1, i * 3 + 1],
-            sol_state[-1, i * 3 + 2],
-            color=traj[0].get_color(),
+            trajectories[i, 0],
+            trajectories[i, 1],
+            trajectories[i, 2],
+            color=colors_i,
             label=labels_i,
             marker=marker,
             markersize=markersize,
+            markevery=[-1],
         )
 
     set_3d_axes_equal(ax)
@@ -260,66 +315,51 @@ def _animation_get_axes_lim(
     lim_max : float
         Maximum axes limits
     """
-    if dim == 2:
-        xmax = np.max(sol_state[:, 0 * 3])
-        xmin = np.min(sol_state[:, 0 * 3])
-        ymax = np.max(sol_state[:, 0 * 3 + 1])
-        ymin = np.min(sol_state[:, 0 * 3 + 1])
-
-        for i in range(objects_count):
-            xmax = max(xmax, np.max(sol_state[:, i * 3]))
-            xmin = min(xmin, np.min(sol_state[:, i * 3]))
-            ymax = max(ymax, np.max(sol_state[:, i * 3 + 1]))
-            ymin = min(ymin, np.min(sol_state[:, i * 3 + 1]))
-
-        lim_max = max(xmax, ymax)
-        lim_min = min(xmin, ymin)
-
-        if lim_max > 0:
-            lim_max *= 1.1
-        else:
-            lim_max *= 0.9
+    if dim not in (2, 3):
+        raise ValueError("Invalid dimension")
 
-        if lim_min < 0:
-            lim_min *= 1.1
-        else:
-            lim_min *= 0.9
-
-    elif dim == 3:
-        xmax = np.max(sol_state[:, 0 * 3])
-        xmin = np.min(sol_state[:, 0 * 3])
-        ymax = np.max(sol_state[:, 0 * 3 + 1])
-        ymin = np.min(sol_state[:, 0 * 3 + 1])
-        zmax = np.max(sol_state[:, 0 * 3 + 2])
-        zmin = np.min(sol_state[:, 0 * 3 + 2])
-
-        for i in range(1, objects_count):
-            xmax = max(xmax, np.max(sol_state[:, i * 3]))
-            xmin = min(xmin, np.min(sol_state[:, i * 3]))
-            ymax = max(ymax, np.max(sol_state[:, i * 3 + 1]))
-            ymin = min(ymin, np.min(sol_state[:, i * 3 + 1]))
-            zmax = max(zmax, np.max(sol_state[:, i * 3 + 2]))
-            zmin = min(zmin, np.min(sol_state[:, i * 3 + 2]))
-
-        lim_max = max(xmax, ymax, zmax)
-        lim_min = min(xmin, ymin, zmin)
-
-        if lim_max > 0:
-            lim_max *= 1.1
-        else:
-            lim_max *= 0.9
+    # Reduce over all objects and time steps at once, instead of
+    # computing the limits of each object and axis separately
+    positions = sol_state[:, : objects_count * 3].reshape(-1, objects_count, 3)
+    lim_max = np.max(positions[..., :dim])
+    lim_min = np.min(positions[..., :dim])
 
-        if lim_min < 0:
-            lim_min *= 1.1
-        else:
-            lim_min *= 0.9
+    if lim_max > 0:
+        lim_max *= 1.1
+    else:
+        lim_max *= 0.9
 
+    if lim_min < 0:
+        lim_min *= 1.1
     else:
-        raise ValueError("Invalid dimension")
+        lim_min *= 0.9
 
     return lim_min, lim_max
 
 
+def _save_animation_frame(fig: "plt.Figure", file_path: Path) -> None:
+    """
+    Save the current figure as a temporary animation frame
+
+    The frame is rendered on the figure canvas at the figure dpi and saved
+    as an opaque RGB PNG with light compression. The alpha channel is not
+    needed since the GIF frames are opaque, and the frames are deleted
+    after the GIF is combined, so spending time on compression is wasteful.
+
+    Parameters
+    ----------
+    fig : plt.Figure
+        Figure to be saved
+    file_path : Path
+        Path to save the frame
+    """
+    import PIL.Image
+
+    fig.canvas.draw()
+    frame = np.asarray(fig.canvas.buffer_rgba())[..., :3]  # type: ignore
+    PIL.Image.fromarray(frame).save(file_path, format="png", compress_level=1)
+
+
 def animate_2d_traj_gif(
     file_path: str | Path,
     sol_state: np.ndarray,
@@ -394,7 +434,14 @@ def animate_2d_traj_gif(
 
     objects_count = sol_state.shape[1] // 6
 
-    fig = plt.figure()
+    import PIL.Image
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # Render off-screen with the Agg canvas, bypassing the pyplot
+    # figure manager and any interactive GUI backend
+    fig = Figure(dpi=dpi)
+    FigureCanvasAgg(fig)
     ax = fig.add_subplot(111, aspect="equal")
 
     if not is_dynamic_axes:
@@ -411,134 +458,111 @@ def animate_2d_traj_gif(
             xlim_min, xlim_max = _animation_get_axes_lim(2, objects_count, sol_state)
             ylim_min, ylim_max = xlim_min, xlim_max
 
-        data_size = len(sol_state)
-        progress_bar = utils.Progress_bar()
-        num_frames_count = 0
-
-        if not is_maintain_fixed_dt:
-            with progress_bar:
-                for i in progress_bar.track(range(data_size)):
-                    if i % plotting_freq != 0:
-                        continue
-
-                    # Plot the trajectory from the beginning to current position
-                    if traj_len == -1:
-                        start_index = 0
-                    else:
-                        start_index = np.clip(i + 1 - traj_len, 0, None)
-
-                    for j in range(objects_count):
-                        colors_j = None
-                        labels_j = None
-                        if colors is not None:
-                            colors_j = colors[j]
-                        if labels is not None:
-                            labels_j = labels[j]
-                        traj = ax.plot(
-                            sol_state[start_index : (i + 1), j * 3],
-                            sol_state[start_index : (i + 1), j * 3 + 1],
-                            color=colors_j,
-                        )
-                        # Plot the current position as a filled circle
-                        ax.plot(
-                            sol_state[i, j * 3],
-                            sol_state[i, j * 3 + 1],
-                            color=traj[0].get_color(),
-                            label=labels_j,
-                            marker=marker,
-                            markersize=markersize,
-                        )
-                    # Add legend at the beginning
-                    # Warning: if we keep adding legend, the memory consumption will keep increasing
-                    if legend and i == 0:
-                        fig.legend(loc="center right", borderaxespad=0.2)
-
-                    # Set axis labels before capturing the frame
-                    ax.set_xlabel(xlabel)
-                    ax.set_ylabel(ylabel)
-
-                    if not is_dynamic_axes:
-                        ax.set_xlim((xlim_min, xlim_max))
-                        ax.set_ylim((ylim_min, ylim_max))
-
-                    # Capture the frame
-                    plt.savefig(
-                        Path(file_path).parent / f"frames_{num_frames_count:06d}.png",
-                        dpi=dpi,
-                    )
-                    num_frames_count += 1
+        ax.set_xlim((xlim_min, xlim_max))
+        ax.set_ylim((ylim_min, ylim_max))
 
-                    # Clear the plot to prepare for the next frame
-                    ax.clear()
-        else:
-            if sol_time is None:
-                raise ValueError("Solution time is required to maintain fixed dt")
-
-            # Attempt to maintain fixed dt for the animation
-            frame_size = int(data_size / plotting_freq) + 1
-            plot_time = np.linspace(
-                sol_time[0],
-                sol_time[-1],
-                frame_size,
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+    # Create the artists once and update their data for each frame,
+    # instead of re-plotting every object and clearing the axes per frame
+    traj_lines = []
+    current_pos_markers = []
+    for j in range(objects_count):
+        colors_j = None
+        labels_j = None
+        if colors is not None:
+            colors_j = colors[j]
+        if labels is not None:
+            labels_j = labels[j]
+        (traj,) = ax.plot([], [], color=colors_j)
+        # The current position is plotted as a filled circle
+        (current_pos,) = ax.plot(
+            [],
+            [],
+            color=traj.get_color(),
+            label=labels_j,
+            marker=marker,
+            markersize=markersize,
+        )
+        traj_lines.append(traj)
+        current_pos_markers.append(current_pos)
+
+    if legend:
+        fig.legend(loc="center right", borderaxespad=0.2)
+
+    trajectories = _get_trajectories(sol_state)
+
+    def update_frame(start_index: int, end_index: int) -> None:
+        """Update the artists to show the trajectory from start_index to end_index"""
+        for j in range(objects_count):
+            traj_lines[j].set_data(
+                trajectories[j, 0, start_index : (end_index + 1)],
+                trajectories[j, 1, start_index : (end_index + 1)],
+            )
+            current_pos_markers[j].set_data(
+                trajectories[j, 0, end_index : (end_index + 1)],
+                trajectories[j, 1, end_index : (end_index + 1)],
             )
-            with progress_bar:
-                # Plot once every nth point
-                for i in progress_bar.track(range(frame_size)):
-                    # Search the index with the closest value of time
-                    index = np.searchsorted(sol_time, plot_time[i])
-
-                    if traj_len == -1:
-                        start_index = 0
-                    else:
-                        start_index = np.searchsorted(
-                            sol_time, plot_time[np.clip(i - traj_len, 0, None)]
-                        )
-
-                    # Plot the trajectory from the beginning to current position
-                    for j in range(objects_count):
-                        colors_j = None
-                        labels_j = None
-                        if colors is not None:
-                            colors_j = colors[j]
-                        if labels is not None:
-                            labels_j = labels[j]
-                        traj = ax.plot(
-                            sol_state[(start_index + 1) : (index + 1), j * 3],
-                            sol_state[(start_index + 1) : (index + 1), j * 3 + 1],
-                            color=colors_j,
-                        )
-                        # Plot the current position as a filled circle
-                        ax.plot(
-                            sol_state[index, j * 3],
-                            sol_state[index, j * 3 + 1],
-                            color=traj[0].get_color(),
-                            label=labels_j,
-                            marker=marker,
-                            markersize=markersize,
-                        )
-                    # Add legend at the beginning
-                    # Warning: if we keep adding legend, the memory consumption will keep increasing
-                    if legend and i == 0:
-                        fig.legend(loc="center right", borderaxespad=0.2)
-
-                    # Set axis labels before capturing the frame
-                    ax.set_xlabel(xlabel)
-                    ax.set_ylabel(ylabel)
-
-                    if not is_dynamic_axes:
-                        ax.set_xlim((xlim_min, xlim_max))
-                        ax.set_ylim((ylim_min, ylim_max))
-
-                    # Capture the frame
-                    plt.savefig(
-                        Path(file_path).parent / f"frames_{num_frames_count:06d}.png",
-                        dpi=dpi,
-                        format="png",
+
+        if is_dynamic_axes:
+            ax.relim()
+            ax.autoscale_view()
+
+    data_size = len(sol_state)
+    progress_bar = utils.Progress_bar()
+    num_frames_count = 0
+
+    if not is_maintain_fixed_dt:
+        with progress_bar:
+            # Only the plotted rows are iterated and tracked, instead of
+            # advancing the progress bar for every skipped row
+            for i in progress_bar.track(range(0, data_size, plotting_freq)):
+                # Plot the trajectory from the beginning to current position
+                if traj_len == -1:
+                    start_index = 0
+                else:
+                    start_index = np.clip(i + 1 - traj_len, 0, None)
+
+                update_frame(start_index, i)
+
+                # Capture the frame
+                _save_animation_frame(
+                    fig, Path(file_path).parent / f"frames_{num_frames_count:06d}.png"
+                )
+                num_frames_count += 1
+    else:
+        if sol_time is None:
+            raise ValueError("Solution time is required to maintain fixed dt")
+
+        # Attempt to maintain fixed dt for the animation
+        frame_size = data_size // plotting_freq + 1
+        plot_time = np.linspace(
+            sol_time[0],
+            sol_time[-1],
+            frame_size,
+        )
+        with progress_bar:
+            # Plot once every nth point
+            for i in progress_bar.track(range(frame_size)):
+                # Search the index with the closest value of time
+                index = np.searchsorted(sol_time, plot_time[i])
+
+                if traj_len == -1:
+                    start_index = 0
+                else:
+                    start_index = np.searchsorted(
+                        sol_time, plot_time[np.clip(i - traj_len, 0, None)]
                     )
-                    num_frames_count += 1
 
-                    # Clear the plot to prepare for the next frame
-                    ax.clear()
+                # Plot the trajectory from the beginning to current position
+                update_frame(start_index + 1, index)
+
+                # Capture the frame
+                _save_animation_frame(
+                    fig, Path(file_path).parent / f"frames_{num_frames_count:06d}.png"
+                )
+                num_frames_count += 1
 
     print("Combining frames to gif...")
 
@@ -556,8 +580,6 @@ def animate_2d_traj_gif(
         loop=0,
     )
 
-    plt.close("all")
-
     for i in range(num_frames_count):
         (Path(file_path).parent / f"frames_{i:06d}.png").unlink()
 
@@ -639,7 +661,14 @@ def animate_3d_traj_gif(
 
     objects_count = sol_state.shape[1] // 6
 
-    fig = plt.figure()
+    import PIL.Image
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # Render off-screen with the Agg canvas, bypassing the pyplot
+    # figure manager and any interactive GUI backend
+    fig = Figure(dpi=dpi)
+    FigureCanvasAgg(fig)
     ax = fig.add_subplot(111, projection="3d")
 
     if not is_dynamic_axes:
@@ -659,85 +688,106 @@ def animate_3d_traj_gif(
             ylim_min, ylim_max = xlim_min, xlim_max
             zlim_min, zlim_max = xlim_min, xlim_max
 
+        ax.set_xlim3d((xlim_min, xlim_max))  # type: ignore
+        ax.set_ylim3d((ylim_min, ylim_max))  # type: ignore
+        ax.set_zlim3d((zlim_min, zlim_max))  # type: ignore
+
+        # Set equal aspect ratio to prevent distortion
+        ax.set_aspect("equal")
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_zlabel(zlabel)  # type: ignore
+
+    # Create the artists once and update their data for each frame,
+    # so that only the changed data is updated between frames
+    traj_lines = []
+    current_pos_markers = []
+    for j in range(objects_count):
+        colors_j = None
+        labels_j = None
+        if colors is not None:
+            colors_j = colors[j]
+        if labels is not None:
+            labels_j = labels[j]
+        (traj,) = ax.plot([], [], [], color=colors_j)
+        # The current position is plotted as a filled circle
+        (current_pos,) = ax.plot(
+            [],
+            [],
+            [],
+            color=traj.get_color(),
+            label=labels_j,
+            marker=marker,
+            markersize=markersize,
+        )
+        traj_lines.append(traj)
+        current_pos_markers.append(current_pos)
+
+    if legend:
+        fig.legend(loc="center right", borderaxespad=0.2)
+
+        # Adjust figure for the legend
+        fig.subplots_adjust(right=0.7)
+        fig.tight_layout()
+
+    trajectories = _get_trajectories(sol_state)
+
+    def update_frame(start_index: int, end_index: int) -> None:
+        """Update the artists to show the trajectory from start_index to end_index"""
+        for j in range(objects_count):
+            traj_lines[j].set_data_3d(  # type: ignore
+                trajectories[j, 0, start_index : (end_index + 1)],
+                trajectories[j, 1, start_index : (end_index + 1)],
+                trajectories[j, 2, start_index : (end_index + 1)],
+            )
+            current_pos_markers[j].set_data_3d(  # type: ignore
+                trajectories[j, 0, end_index : (end_index + 1)],
+                trajectories[j, 1, end_index : (end_index + 1)],
+                trajectories[j, 2, end_index : (end_index + 1)],
+            )
+
+        if is_dynamic_axes:
+            # Include the current position even if the trail is empty
+            visible_x = trajectories[
+                :, :, min(start_index, end_index) : (end_index + 1)
+            ]
+            visible_min = np.min(visible_x, axis=(0, 2))
+            visible_max = np.max(visible_x, axis=(0, 2))
+            ax.set_xlim3d((visible_min[0], visible_max[0]))  # type: ignore
+            ax.set_ylim3d((visible_min[1], visible_max[1]))  # type: ignore
+            ax.set_zlim3d((visible_min[2], visible_max[2]))  # type: ignore
+            set_3d_axes_equal(ax)
+            ax.set_aspect("equal")
+
     data_size = len(sol_state)
     progress_bar = utils.Progress_bar()
     num_frames_count = 0
     if not is_maintain_fixed_dt:
         with progress_bar:
-            for i in progress_bar.track(range(data_size)):
-                if i % plotting_freq != 0:
-                    continue
-
+            # Only the plotted rows are iterated and tracked, instead of
+            # advancing the progress bar for every skipped row
+            for i in progress_bar.track(range(0, data_size, plotting_freq)):
                 # Plot the trajectory from the beginning to current position
                 if traj_len == -1:
                     start_index = 0
                 else:
                     start_index = np.clip(i + 1 - traj_len, 0, None)
 
-                for j in range(objects_count):
-                    colors_j = None
-                    labels_j = None
-                    if colors is not None:
-                        colors_j = colors[j]
-                    if labels is not None:
-                        labels_j = labels[j]
-                    traj = ax.plot(
-                        sol_state[start_index : (i + 1), j * 3],
-                        sol_state[start_index : (i + 1), j * 3 + 1],
-                        sol_state[start_index : (i + 1), j * 3 + 2],
-                        color=colors_j,
-                    )
-                    # Plot the current position as a filled circle
-                    ax.plot(
-                        sol_state[i, j * 3],
-                        sol_state[i, j * 3 + 1],
-                        sol_state[i, j * 3 + 2],
-                        color=traj[0].get_color(),
-                        label=labels_j,
-                        marker=marker,
-                        markersize=markersize,
-                    )
-                # Add legend at the beginning
-                # Warning: if we keep adding legend, the memory consumption will keep increasing
-                if legend and i == 0:
-                    fig.legend(loc="center right", borderaxespad=0.2)
-
-                    # Adjust figure for the legend
-                    if i == 0:
-                        fig.subplots_adjust(right=0.7)
-                        fig.tight_layout()
-
-                # Set axis labels before capturing the frame
-                ax.set_xlabel(xlabel)
-                ax.set_ylabel(ylabel)
-                ax.set_zlabel(zlabel)  # type: ignore
-
-                if not is_dynamic_axes:
-                    ax.set_xlim3d((xlim_min, xlim_max))  # type: ignore
-                    ax.set_ylim3d((ylim_min, ylim_max))  # type: ignore
-                    ax.set_zlim3d((zlim_min, zlim_max))  # type: ignore
-                else:
-                    set_3d_axes_equal(ax)
-
-                # Set equal aspect ratio to prevent distortion
-                ax.set_aspect("equal")
+                update_frame(start_index, i)
 
                 # Capture the frame
-                plt.savefig(
-                    Path(file_path).parent / f"frames_{num_frames_count:06d}.png",
-                    dpi=dpi,
+                _save_animation_frame(
+                    fig, Path(file_path).parent / f"frames_{num_frames_count:06d}.png"
                 )
                 num_frames_count += 1
 
-                # Clear the plot to prepare for the next frame
-                ax.clear()
-
     else:
         if sol_time is None:
             raise ValueError("Solution time is required to maintain fixed dt")
 
         # Attempt to maintain fixed dt for the animation
-        frame_size = int(data_size / plotting_freq) + 1
+        frame_size = data_size // plotting_freq + 1
         plot_time = np.linspace(
             sol_time[0],
             sol_time[-1],
@@ -757,59 +807,14 @@ def animate_3d_traj_gif(
                     )
 
                 # Plot the trajectory from the beginning to current position
-                for j in range(objects_count):
-                    colors_j = None
-                    labels_j = None
-                    if colors is not None:
-                        colors_j = colors[j]
-                    if labels is not None:
-                        labels_j = labels[j]
-                    traj = ax.plot(
-                        sol_state[(start_index + 1) : (index + 1), j * 3],
-                        sol_state[(start_index + 1) : (index + 1), j * 3 + 1],
-                        sol_state[(start_index + 1) : (index + 1), j * 3 + 2],
-                        color=colors_j,
-                    )
-                    # Plot the current position as a filled circle
-                    ax.plot(
-                        sol_state[index, j * 3],
-                        sol_state[index, j * 3 + 1],
-                        sol_state[index, j * 3 + 2],
-                        color=traj[0].get_color(),
-                        label=labels_j,
-                        marker=marker,
-                        markersize=markersize,
-                    )
-                # Add legend at the beginning
-                # Warning: if we keep adding legend, the memory consumption will keep increasing
-                if legend and i == 0:
-                    fig.legend(loc="center right", bbox_to_anchor=(1.325, 0.5))
-
-                # Set axis labels before capturing the frame
-                ax.set_xlabel(xlabel)
-                ax.set_ylabel(ylabel)
-                ax.set_zlabel(zlabel)  # type: ignore
-
-                if not is_dynamic_axes:
-                    ax.set_xlim3d((xlim_min, xlim_max))  # type: ignore
-                    ax.set_ylim3d((ylim_min, ylim_max))  # type: ignore
-                    ax.set_zlim3d((zlim_min, zlim_max))  # type: ignore
-                else:
-                    set_3d_axes_equal(ax)
-
-                # Set equal aspect ratio to prevent distortion
-                ax.set_aspect("equal")
+                update_frame(start_index + 1, index)
 
                 # Capture the frame
-                plt.savefig(
-                    Path(file_path).parent / f"frames_{num_frames_count:06d}.png",
-                    dpi=dpi,
+                _save_animation_frame(
+                    fig, Path(file_path).parent / f"frames_{num_frames_count:06d}.png"
                 )
                 num_frames_count += 1
 
-                # Clear the plot to prepare for the next frame
-                ax.clear()
-
     print("Combining frames to gif...")
 
     def frames_generator(num_frames_count):
@@ -826,12 +831,56 @@ def animate_3d_traj_gif(
         loop=0,
     )
 
-    plt.close("all")
-
     for i in range(num_frames_count):
         (Path(file_path).parent / f"frames_{i:06d}.png").unlink()
 
 
+def _get_decimation_indices(
+    quantity: np.ndarray, max_buckets: int = 5000
+) -> np.ndarray:
+    """
+    Get the indices of a time series to be plotted
+
+    The time series is divided into buckets of consecutive points, and only
+    the minimum and maximum of each bucket are kept, together with the first
+    and last points. This keeps the visual envelope of the curve, including
+    spikes, while limiting the number of points passed to matplotlib.
+
+    Parameters
+    ----------
+    quantity : np.ndarray
+        1D array of the quantity to be plotted
+    max_buckets : int, optional
+        Maximum number of buckets, by default 5000
+
+    Returns
+    -------
+    indices : np.ndarray
+        Sorted indices of the points to be plotted
+    """
+    npts = len(quantity)
+    if npts <= 2 * max_buckets:
+        return np.arange(npts)
+
+    bucket_size = -(-npts // max_buckets)
+    buckets_count = npts // bucket_size
+    buckets = quantity[: buckets_count * bucket_size].reshape(
+        buckets_count, bucket_size
+    )
+    offsets = np.arange(buckets_count) * bucket_size
+    indices = np.concatenate(
+        (
+            [0, npts - 1],
+            offsets + np.argmin(buckets, axis=1),
+            offsets + np.argmax(buckets, axis=1),
+            # Remaining points that do not fill a whole bucket
+            np.arange(buckets_count * bucket_size, npts),
+        )
+    )
+
+    return np.unique(indices)
+
+
 def plot_quantity_against_time(
     quantity: np.ndarray,
     sol_time: np.ndarray,
@@ -863,12 +912,17 @@ def plot_quantity_against_time(
     save_fig_path : Optional[str], optional
         Path to save the figure, by default None
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
+
+    # Only plot the points that affect the rendered curve
+    indices = _get_decimation_indices(quantity)
     if is_log_y:
-        ax.semilogy(sol_time, quantity)
+        ax.semilogy(sol_time[indices], quantity[indices])
     else:
-        ax.plot(sol_time, quantity)
+        ax.plot(sol_time[indices], quantity[indices])
 
     if title is not None:
         ax.set_title(title)
@@ -921,6 +975,8 @@ def plot_eccentricity_or_inclination(
     save_fig_path : Optional[str], optional
         Path to save the figure, by default None
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
     for i in range(eccentricity_or_inclination.shape[1]):
@@ -934,9 +990,10 @@ def plot_eccentricity_or_inclination(
         else:
             labels_i = None
 
-        ax.plot(
-            sol_time, eccentricity_or_inclination[:, i], color=colors_i, label=labels_i
-        )
+        # Only plot the points that affect the rendered curve
+        data_i = eccentricity_or_inclination[:, i]
+        indices = _get_decimation_indices(data_i)
+        ax.plot(sol_time[indices], data_i[indices], color=colors_i, label=labels_i)
 
     if title is not None:
         ax.set_title(title)
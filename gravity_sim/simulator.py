@@ -7,11 +7,10 @@ Author: Ching Yin Ng
 import copy
 import ctypes
 import threading
-import time
 import timeit
 from pathlib import Path
 from queue import Queue
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
 
@@ -35,8 +34,13 @@ class Simulator:
         "ias15",
         "whfast",
     ]
-    FIXED_STEP_SIZE_INTEGRATORS = ["euler", "euler_cromer", "rk4", "leapfrog", "whfast"]
-    ADAPTIVE_STEP_SIZE_INTEGRATORS = ["rkf45", "dopri", "dverk", "rkf78", "ias15"]
+    # Only used for membership checks, so they are stored as frozensets
+    FIXED_STEP_SIZE_INTEGRATORS = frozenset(
+        ["euler", "euler_cromer", "rk4", "leapfrog", "whfast"]
+    )
+    ADAPTIVE_STEP_SIZE_INTEGRATORS = frozenset(
+        ["rkf45", "dopri", "dverk", "rkf78", "ias15"]
+    )
     # Recommended settings for built-in systems with IAS15 integrator
     RECOMMENDED_SETTINGS_BUILT_IN_SYSTEMS = {
         # "template": ["tf", "tf unit", "tolerance", "storing_freq"],
@@ -101,9 +105,17 @@ class Simulator:
         else:
             flush_path_ctypes = None
 
-        sol_state_ctypes = ctypes.POINTER(ctypes.c_double)()
-        sol_time_ctypes = ctypes.POINTER(ctypes.c_double)()
-        sol_dt_ctypes = ctypes.POINTER(ctypes.c_double)()
+        # Bind the system attributes to locals once, since x, v and m are
+        # properties that create a new view on every access
+        objects_count = gravitational_system.objects_count
+        x = gravitational_system.x
+        v = gravitational_system.v
+        m = gravitational_system.m
+        c_double_p = ctypes.POINTER(ctypes.c_double)
+
+        sol_state_ctypes = c_double_p()
+        sol_time_ctypes = c_double_p()
+        sol_dt_ctypes = c_double_p()
         sol_size_ctypes = ctypes.c_int64()
         t_ctypes = ctypes.c_double()
         simulation_last_dt_ctypes = ctypes.c_double()
@@ -124,10 +136,10 @@ class Simulator:
             args=(
                 self.c_lib.launch_simulation_python,
                 queue,
-                gravitational_system.x.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                gravitational_system.v.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                gravitational_system.m.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.c_int(gravitational_system.objects_count),
+                x.ctypes.data_as(c_double_p),
+                v.ctypes.data_as(c_double_p),
+                m.ctypes.data_as(c_double_p),
+                ctypes.c_int(objects_count),
                 ctypes.c_double(gravitational_system.G),
                 integrator_params["integrator"].encode("utf-8"),
                 ctypes.c_double(integrator_params["dt"]),
@@ -164,10 +176,11 @@ class Simulator:
         if not settings["disable_progress_bar"]:
             progress_bar_thread.start()
 
+        # Wait with a timeout so that KeyboardInterrupt is still handled
+        # in the main thread, while returning as soon as the simulation
+        # finishes instead of at the end of a fixed sleep
         while simulation_thread.is_alive():
-            time.sleep(0.05)
-
-        simulation_thread.join()
+            simulation_thread.join(0.05)
         if not settings["disable_progress_bar"]:
             t_ctypes.value = tf
             progress_bar_thread.join()
@@ -185,10 +198,16 @@ class Simulator:
         if storing_params["method"] == "default":
             self.data_size_ = sol_size_ctypes.value
 
-            self.sol_state_ = np.ctypeslib.as_array(
+            sol_state = np.ctypeslib.as_array(
                 sol_state_ctypes,
-                shape=(self.data_size_, self.gravitational_system.objects_count * 6),
-            ).copy()
+                shape=(self.data_size_, objects_count * 6),
+            )
+            if "memmap_path" in storing_params:
+                self.sol_state_ = self._store_memmap(
+                    Path(storing_params["memmap_path"]), sol_state
+                )
+            else:
+                self.sol_state_ = sol_state.copy()
             self.sol_time_ = np.ctypeslib.as_array(
                 sol_time_ctypes, shape=(self.data_size_,)
             ).copy()
@@ -200,72 +219,166 @@ class Simulator:
             self.c_lib.free_memory_real(sol_time_ctypes)
             self.c_lib.free_memory_real(sol_dt_ctypes)
 
-    def compute_energy(
+    @staticmethod
+    def _store_memmap(memmap_path: Path, sol_state: np.ndarray) -> np.memmap:
+        """Store the solution state in a memory-mapped .npy file
+
+        Parameters
+        ----------
+        memmap_path : Path
+            Path of the .npy file. If the file already exists, a suffix
+            "_0", "_1", ... is added to the file name.
+        sol_state : np.ndarray
+            Solution state of the system
+
+        Returns
+        -------
+        np.memmap
+            Solution state mapped from the file
+
+        Notes
+        -----
+        The data lives in the file instead of the heap, and is only paged
+        into memory when accessed. The file can be reopened later with
+        np.load(memmap_path, mmap_mode="r").
+        Existing files are never overwritten, as they may still be mapped
+        by the results of a previous simulation.
+        """
+        memmap_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path = memmap_path
+        i = 0
+        while file_path.exists():
+            file_path = memmap_path.with_name(
+                f"{memmap_path.stem}_{i}{memmap_path.suffix}"
+            )
+            i += 1
+
+        sol_state_memmap = np.lib.format.open_memmap(
+            file_path, mode="w+", dtype=np.float64, shape=sol_state.shape
+        )
+        sol_state_memmap[:] = sol_state
+        sol_state_memmap.flush()
+
+        return sol_state_memmap
+
+    def _run_c_lib_function(
         self,
+        c_lib_function: Callable[..., None],
         objects_count: int,
         m: np.ndarray,
-        G: float,
         sol_state: np.ndarray,
-        is_exit_ctypes_bool: Optional[ctypes.c_bool] = None,
+        is_exit_ctypes_bool: ctypes.c_bool,
+        G: Optional[float] = None,
     ) -> np.ndarray:
-        """Compute energy of the system
+        """Run a C library function that computes a quantity at each time
+        step of the solution state, with a progress bar
 
         Parameters
         ----------
+        c_lib_function : Callable[..., None]
+            C library function with arguments
+            (objects_count, m, [G,] npts, count, result, sol_state, is_exit)
         objects_count : int
             Number of objects in the system
         m : np.ndarray
             Masses of the objects
-        G : float
-            Gravitational constant
         sol_state : np.ndarray
             Solution state of the system
-        is_exit_ctypes_bool : ctypes.c_bool, optional
-            Flag to indicate if the function should be terminated, by default None
+        is_exit_ctypes_bool : ctypes.c_bool
+            Flag to indicate if the function should be terminated
+        G : float, optional
+            Gravitational constant, only passed if not None
         Returns
         -------
         np.ndarray
-            Energy of the system at each time step
+            Computed quantity at each time step
         """
-        if is_exit_ctypes_bool is None:
-            is_exit_ctypes_bool = ctypes.c_bool(False)
-
-        print("Computing energy...")
         npts = len(sol_state)
-        energy = np.zeros(npts)
+        # The C library reads the arrays as contiguous float64, so
+        # convert them once if needed (no copy if they already are)
+        m = np.ascontiguousarray(m, dtype=np.float64)
+        sol_state = np.ascontiguousarray(sol_state, dtype=np.float64)
+        # Every element is written by the C library, so the array is
+        # not zero-initialized
+        result = np.empty(npts)
+
+        leading_args: list = [
+            ctypes.c_int(objects_count),
+            m.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+        ]
+        if G is not None:
+            leading_args.append(ctypes.c_double(G))
 
         start = timeit.default_timer()
         count = ctypes.c_int(0)
-        progress_bar_thread = threading.Thread(
-            target=utils.progress_bar_c_lib_function,
-            args=(npts, count, is_exit_ctypes_bool),
-        )
-        progress_bar_thread.start()
-        compute_energy_thread = threading.Thread(
-            target=self.c_lib.compute_energy_python,
+        c_lib_function_thread = threading.Thread(
+            target=c_lib_function,
             args=(
-                ctypes.c_int(objects_count),
-                m.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.c_double(G),
+                *leading_args,
                 ctypes.c_int(npts),
                 ctypes.byref(count),
-                energy.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+                result.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
                 sol_state.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
                 ctypes.byref(is_exit_ctypes_bool),
             ),
         )
-        compute_energy_thread.start()
-        compute_energy_thread.join()
+        c_lib_function_thread.start()
 
-        # Close progress bar thread
-        count.value = npts
-        progress_bar_thread.join()
+        # The progress bar is shown in this thread until the C library
+        # function returns
+        utils.progress_bar_c_lib_function(npts, count, c_lib_function_thread)
 
         stop = timeit.default_timer()
         print(f"Run time: {(stop - start):.3f} s")
         print("")
 
-        return energy
+        return result
+
+    def compute_energy(
+        self,
+        objects_count: int,
+        m: np.ndarray,
+        G: float,
+        sol_state: np.ndarray,
+        is_exit_ctypes_bool: Optional[ctypes.c_bool] = None,
+    ) -> np.ndarray:
+        """Compute energy of the system
+
+        Parameters
+        ----------
+        objects_count : int
+            Number of objects in the system
+        m : np.ndarray
+            Masses of the objects
+        G : float
+            Gravitational constant
+        sol_state : np.ndarray
+            Solution state of the system
+        is_exit_ctypes_bool : ctypes.c_bool, optional
+            Flag to indicate if the function should be terminated, by default None
+        Returns
+        -------
+        np.ndarray
+            Energy of the system at each time step
+
+        Notes
+        -----
+        The energy is computed and returned in double precision. The
+        relative energy error of a simulation is often far below the
+        resolution of single precision, so the state is not downcast.
+        """
+        if is_exit_ctypes_bool is None:
+            is_exit_ctypes_bool = ctypes.c_bool(False)
+
+        print("Computing energy...")
+        return self._run_c_lib_function(
+            self.c_lib.compute_energy_python,
+            objects_count,
+            m,
+            sol_state,
+            is_exit_ctypes_bool,
+            G=G,
+        )
 
     def compute_linear_momentum(
         self,
@@ -295,40 +408,13 @@ class Simulator:
             is_exit_ctypes_bool = ctypes.c_bool(False)
 
         print("Computing linear momentum...")
-        npts = len(sol_state)
-        linear_momentum = np.zeros(npts)
-
-        start = timeit.default_timer()
-        count = ctypes.c_int(0)
-        progress_bar_thread = threading.Thread(
-            target=utils.progress_bar_c_lib_function,
-            args=(npts, count, is_exit_ctypes_bool),
+        return self._run_c_lib_function(
+            self.c_lib.compute_linear_momentum_python,
+            objects_count,
+            m,
+            sol_state,
+            is_exit_ctypes_bool,
         )
-        progress_bar_thread.start()
-        compute_linear_momentum_thread = threading.Thread(
-            target=self.c_lib.compute_linear_momentum_python,
-            args=(
-                ctypes.c_int(objects_count),
-                m.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.c_int(npts),
-                ctypes.byref(count),
-                linear_momentum.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                sol_state.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.byref(is_exit_ctypes_bool),
-            ),
-        )
-        compute_linear_momentum_thread.start()
-        compute_linear_momentum_thread.join()
-
-        # Close progress bar thread
-        count.value = npts
-        progress_bar_thread.join()
-
-        stop = timeit.default_timer()
-        print(f"Run time: {(stop - start):.3f} s")
-        print("")
-
-        return linear_momentum
 
     def compute_angular_momentum(
         self,
@@ -358,40 +444,13 @@ class Simulator:
             is_exit_ctypes_bool = ctypes.c_bool(False)
 
         print("Computing angular momentum...")
-        npts = len(sol_state)
-        angular_momentum = np.zeros(npts)
-
-        start = timeit.default_timer()
-        count = ctypes.c_int(0)
-        progress_bar_thread = threading.Thread(
-            target=utils.progress_bar_c_lib_function,
-            args=(npts, count, is_exit_ctypes_bool),
+        return self._run_c_lib_function(
+            self.c_lib.compute_angular_momentum_python,
+            objects_count,
+            m,
+            sol_state,
+            is_exit_ctypes_bool,
         )
-        progress_bar_thread.start()
-        compute_angular_momentum_thread = threading.Thread(
-            target=self.c_lib.compute_angular_momentum_python,
-            args=(
-                ctypes.c_int(objects_count),
-                m.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.c_int(npts),
-                ctypes.byref(count),
-                angular_momentum.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                sol_state.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
-                ctypes.byref(is_exit_ctypes_bool),
-            ),
-        )
-        compute_angular_momentum_thread.start()
-        compute_angular_momentum_thread.join()
-
-        # Close progress bar thread
-        count.value = npts
-        progress_bar_thread.join()
-
-        stop = timeit.default_timer()
-        print(f"Run time: {(stop - start):.3f} s")
-        print("")
-
-        return angular_momentum
 
     @staticmethod
     def compute_eccentricity(
@@ -427,30 +486,22 @@ class Simulator:
           implementing this in C library in the future.
         """
         print("Computing eccentricity (Assuming the first body is the central star)...")
-        eccentricity = np.zeros(len(sol_state))
 
         start = timeit.default_timer()
-        x = (
-            sol_state[:, 3 : (objects_count * 3)]
-            .reshape(-1, (objects_count - 1), 3)
-            .copy()
-        )
-        v = (
-            sol_state[:, (objects_count + 1) * 3 :]
-            .reshape(-1, (objects_count - 1), 3)
-            .copy()
-        )
-
-        x = x - sol_state[:, :3].reshape(-1, 1, 3)
-        v = v - sol_state[:, (objects_count) * 3 : (objects_count + 1) * 3].reshape(
-            -1, 1, 3
-        )
-
-        eccentricity = (
-            np.cross(v, np.cross(x, v)) / (G * (m[0] + m[1:]))[:, np.newaxis]
-            - x / np.linalg.norm(x, axis=2)[:, :, np.newaxis]
-        )
-        eccentricity = np.linalg.norm(eccentricity, axis=2)
+        # Position and velocity relative to the central object, taken from
+        # a single (npts, 2, N, 3) view of the solution state. The
+        # subtraction creates the arrays directly, without extra copies
+        state = sol_state.reshape(-1, 2, objects_count, 3)
+        x = state[:, 0, 1:] - state[:, 0, :1]
+        v = state[:, 1, 1:] - state[:, 1, :1]
+
+        # Eccentricity vector e = (v x (x x v)) / mu - x / |x|,
+        # computed in place to avoid allocating temporary arrays
+        eccentricity_vec = np.cross(v, np.cross(x, v))
+        eccentricity_vec /= (G * (m[0] + m[1:]))[:, np.newaxis]
+        x /= np.linalg.norm(x, axis=2)[:, :, np.newaxis]
+        eccentricity_vec -= x
+        eccentricity = np.linalg.norm(eccentricity_vec, axis=2)
 
         stop = timeit.default_timer()
         print(f"Run time: {(stop - start):.3f} s")
@@ -490,32 +541,22 @@ class Simulator:
             implementing this in C library in the future.
         """
         print("Computing inclination (Assuming the first body is the central star)...")
-        inclination = np.zeros(len(sol_state))
 
         start = timeit.default_timer()
-        x = (
-            sol_state[:, 3 : (objects_count * 3)]
-            .reshape(-1, (objects_count - 1), 3)
-            .copy()
-        )
-        v = (
-            sol_state[:, (objects_count + 1) * 3 :]
-            .reshape(-1, (objects_count - 1), 3)
-            .copy()
-        )
-
-        x = x - sol_state[:, :3].reshape(-1, 1, 3)
-        v = v - sol_state[:, (objects_count) * 3 : (objects_count + 1) * 3].reshape(
-            -1, 1, 3
+        # Position and velocity relative to the central object, taken from
+        # a single (npts, 2, N, 3) view of the solution state. The
+        # subtraction creates the arrays directly, without extra copies
+        state = sol_state.reshape(-1, 2, objects_count, 3)
+        x = state[:, 0, 1:] - state[:, 0, :1]
+        v = state[:, 1, 1:] - state[:, 1, :1]
+
+        # The inclination is the angle between the specific angular
+        # momentum vector and the z-axis, i.e. arccos(h_z / |h|)
+        angular_momentum_vec = np.cross(x, v)
+        inclination = np.arccos(
+            angular_momentum_vec[:, :, 2] / np.linalg.norm(angular_momentum_vec, axis=2)
         )
 
-        unit_angular_momentum_vector = (
-            np.cross(x, v) / np.linalg.norm(np.cross(x, v), axis=2)[:, :, np.newaxis]
-        )
-        unit_z = np.array([0, 0, 1])
-
-        inclination = np.arccos(np.sum(unit_angular_momentum_vector * unit_z, axis=2))
-
         stop = timeit.default_timer()
         print(f"Run time: {(stop - start):.3f} s")
         print("")
@@ -4,57 +4,74 @@ Utility functions for gravity simulator
 Author: Ching Yin Ng
 """
 
-import csv
 import ctypes
+import os
 import platform
-import sys
+import threading
 import time
 import timeit
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-import rich.progress
-
-# Increase field limit for reading CSV files
-new_field_lim = sys.maxsize
-while True:
-    try:
-        csv.field_size_limit(new_field_lim)
-        break
-    except OverflowError:
-        new_field_lim = new_field_lim // 10
-
-
-class Progress_bar(rich.progress.Progress):
-    def __init__(self):
-        super().__init__(
-            rich.progress.BarColumn(),
-            rich.progress.TextColumn("[green]{task.percentage:>3.0f}%"),
-            rich.progress.TextColumn("•"),
-            rich.progress.TimeElapsedColumn(),
-            rich.progress.TextColumn("•"),
-            rich.progress.TimeRemainingColumn(),
-        )
 
+# rich and csv are imported where they are used, since they are only
+# needed for progress bars and CSV files, and rich is slow to import
+if TYPE_CHECKING:
+    import rich.progress
+
+# Loaded C libraries keyed by the resolved library path, so that
+# creating multiple simulator objects does not reload the library
+_C_LIB_CACHE: dict[str, ctypes.CDLL] = {}
+
+# Default C library built in the src directory for the current platform,
+# resolved once at import time
+_C_LIB_FILE_NAMES = {
+    "Windows": "c_lib.dll",
+    "Darwin": "c_lib.dylib",
+    "Linux": "c_lib.so",
+}
+_PLATFORM_SYSTEM = platform.system()
+_DEFAULT_C_LIB_PATH: Optional[Path] = None
+if _PLATFORM_SYSTEM in _C_LIB_FILE_NAMES:
+    _DEFAULT_C_LIB_PATH = (
+        Path(__file__).parent.parent / "src" / _C_LIB_FILE_NAMES[_PLATFORM_SYSTEM]
+    )
 
-class Progress_bar_with_data_size(rich.progress.Progress):
-    def __init__(self):
-        super().__init__(
-            rich.progress.BarColumn(),
-            rich.progress.TextColumn("[green]{task.percentage:>3.0f}%"),
-            rich.progress.TextColumn("•"),
-            rich.progress.TimeElapsedColumn(),
-            rich.progress.TextColumn("•"),
-            rich.progress.TimeRemainingColumn(),
-            "• [magenta]Data size: {task.fields[store_count]}",
-        )
+
+def Progress_bar() -> "rich.progress.Progress":
+    """Create a progress bar showing the percentage and the elapsed and remaining time"""
+    import rich.progress
+
+    return rich.progress.Progress(
+        rich.progress.BarColumn(),
+        rich.progress.TextColumn("[green]{task.percentage:>3.0f}%"),
+        rich.progress.TextColumn("•"),
+        rich.progress.TimeElapsedColumn(),
+        rich.progress.TextColumn("•"),
+        rich.progress.TimeRemainingColumn(),
+    )
+
+
+def Progress_bar_with_data_size() -> "rich.progress.Progress":
+    """Create a progress bar that also shows the number of stored data points"""
+    import rich.progress
+
+    return rich.progress.Progress(
+        rich.progress.BarColumn(),
+        rich.progress.TextColumn("[green]{task.percentage:>3.0f}%"),
+        rich.progress.TextColumn("•"),
+        rich.progress.TimeElapsedColumn(),
+        rich.progress.TextColumn("•"),
+        rich.progress.TimeRemainingColumn(),
+        "• [magenta]Data size: {task.fields[store_count]}",
+    )
 
 
 def progress_bar_c_lib_function(
     npts: int,
     count: ctypes.c_int | ctypes.c_int64,
-    is_exit_ctypes_bool: ctypes.c_bool,
+    c_lib_function_thread: threading.Thread,
 ):
     """Progress bar for function with C library
 
@@ -64,23 +81,26 @@ def progress_bar_c_lib_function(
         Total number of points
     count : ctypes.c_int | ctypes.c_int64
         Current count
-    is_exit_ctypes_bool : ctypes.c_bool
-        Flag to indicate if the function should be terminated
+    c_lib_function_thread : threading.Thread
+        Started thread running the C library function
+
+    Notes
+    -----
+    The progress bar is updated until c_lib_function_thread finishes.
+    The thread is joined with a timeout instead of sleeping between
+    updates, so this returns as soon as the function is done.
     """
 
     progress_bar = Progress_bar()
     with progress_bar:
-        task = progress_bar.add_task("", total=npts, count=count.value)
+        task = progress_bar.add_task("", total=npts)
 
-        while not is_exit_ctypes_bool.value:
+        while c_lib_function_thread.is_alive():
             # Update progress bar
             progress_bar.update(task, completed=count.value)
-            time.sleep(0.1)
-
-            if count.value >= npts:
-                break
+            c_lib_function_thread.join(0.1)
 
-        progress_bar.update(task, completed=npts)
+        progress_bar.update(task, completed=count.value)
 
 
 def progress_bar_c_lib_simulation(
@@ -121,6 +141,12 @@ def progress_bar_c_lib_simulation(
 def load_c_lib(c_lib_path: Optional[Path] = None) -> ctypes.CDLL:
     """Load the C dynamic-link library
 
+    Parameters
+    ----------
+    c_lib_path : Optional[Path], optional
+        Path to the C library, by default None, which
+        loads the library built in the src directory
+
     Returns
     -------
     c_lib : ctypes.CDLL
@@ -134,23 +160,28 @@ def load_c_lib(c_lib_path: Optional[Path] = None) -> ctypes.CDLL:
         If the C library is not found at the path
     """
     if c_lib_path is None:
-        if platform.system() == "Windows":
-            c_lib_path = Path(__file__).parent.parent / "src" / "c_lib.dll"
-        elif platform.system() == "Darwin":
-            c_lib_path = Path(__file__).parent.parent / "src" / "c_lib.dylib"
-        elif platform.system() == "Linux":
-            c_lib_path = Path(__file__).parent.parent / "src" / "c_lib.so"
-        else:
-            raise Exception(
-                f'Platform "{platform.system()}" not supported. Supported platforms'
-                + ": Windows, macOS, Linux."
+        if _DEFAULT_C_LIB_PATH is None:
+            raise OSError(
+                f'Platform "{_PLATFORM_SYSTEM}" not supported. Supported platforms'
+                + ": Windows, macOS, Linux. "
                 + "You may bypass this error by providing the path to the C library"
             )
+        c_lib_path = _DEFAULT_C_LIB_PATH
+
+    c_lib_path = str(Path(c_lib_path).resolve())
+    c_lib = _C_LIB_CACHE.get(c_lib_path)
+    if c_lib is None:
+        if not Path(c_lib_path).exists():
+            raise FileNotFoundError(f'C library not found at path: "{c_lib_path}"')
+
+        # Resolve all symbols when loading (RTLD_NOW where available), so that
+        # a broken library fails here instead of at the first call
+        c_lib = ctypes.CDLL(
+            c_lib_path, mode=ctypes.DEFAULT_MODE | getattr(os, "RTLD_NOW", 0)
+        )
+        _C_LIB_CACHE[c_lib_path] = c_lib
 
-    if not Path(c_lib_path).exists():
-        raise FileNotFoundError(f'C library not found at path: "{c_lib_path}"')
-
-    return ctypes.cdll.LoadLibrary(str(c_lib_path))
+    return c_lib
 
 
 def initialize_c_lib(c_lib: ctypes.CDLL) -> None:
@@ -166,11 +197,95 @@ def initialize_c_lib(c_lib: ctypes.CDLL) -> None:
     ValueError
         If any C functions that should be available are not found in the C library
     """
-    for function in ["launch_simulation"]:
-        if not hasattr(c_lib, function):
-            raise ValueError(f"Function {function} not found in the C library.")
+    # Check all the required functions at once, so that an outdated
+    # C library fails here with a single error instead of failing
+    # later in the middle of a computation
+    missing_functions = [
+        function
+        for function in [
+            "launch_simulation",
+            "launch_simulation_python",
+            "free_memory_real",
+            "compute_energy_python",
+            "compute_linear_momentum_python",
+            "compute_angular_momentum_python",
+        ]
+        if not hasattr(c_lib, function)
+    ]
+    if len(missing_functions) > 0:
+        raise ValueError(
+            f"Functions {', '.join(missing_functions)} not found in the C library. "
+            + "Please recompile the C library."
+        )
+
+    # Declare the C function signatures once, so that ctypes does not
+    # need to infer the argument types on every call
+    c_double_p = ctypes.POINTER(ctypes.c_double)
+    c_double_pp = ctypes.POINTER(c_double_p)
 
     c_lib.launch_simulation_python.restype = ctypes.c_int
+    c_lib.launch_simulation_python.argtypes = [
+        c_double_p,  # x
+        c_double_p,  # v
+        c_double_p,  # m
+        ctypes.c_int,  # objects_count
+        ctypes.c_double,  # G
+        ctypes.c_char_p,  # integrator
+        ctypes.c_double,  # dt
+        ctypes.c_double,  # tolerance
+        ctypes.c_double,  # initial_dt
+        ctypes.c_double,  # whfast_kepler_tol
+        ctypes.c_int,  # whfast_kepler_max_iter
+        ctypes.c_bool,  # whfast_kepler_auto_remove
+        ctypes.c_double,  # whfast_kepler_auto_remove_tol
+        ctypes.c_char_p,  # acceleration_method
+        ctypes.c_double,  # opening_angle
+        ctypes.c_double,  # softening_length
+        ctypes.c_int,  # order
+        ctypes.c_char_p,  # storing_method
+        ctypes.c_char_p,  # flush_path
+        ctypes.c_int,  # storing_freq
+        c_double_pp,  # sol_state
+        c_double_pp,  # sol_time
+        c_double_pp,  # sol_dt
+        ctypes.POINTER(ctypes.c_int64),  # sol_size
+        c_double_p,  # t
+        c_double_p,  # simulation_status_last_dt
+        c_double_p,  # run_time
+        ctypes.c_int,  # verbose
+        ctypes.POINTER(ctypes.c_bool),  # is_exit
+        ctypes.c_double,  # tf
+    ]
+
+    c_lib.free_memory_real.restype = None
+    c_lib.free_memory_real.argtypes = [c_double_p]
+
+    c_lib.compute_energy_python.restype = None
+    c_lib.compute_energy_python.argtypes = [
+        ctypes.c_int,  # objects_count
+        c_double_p,  # m
+        ctypes.c_double,  # G
+        ctypes.c_int,  # npts
+        ctypes.POINTER(ctypes.c_int),  # count
+        c_double_p,  # energy
+        c_double_p,  # sol_state
+        ctypes.POINTER(ctypes.c_bool),  # is_exit
+    ]
+
+    for function in [
+        c_lib.compute_linear_momentum_python,
+        c_lib.compute_angular_momentum_python,
+    ]:
+        function.restype = None
+        function.argtypes = [
+            ctypes.c_int,  # objects_count
+            c_double_p,  # m
+            ctypes.c_int,  # npts
+            ctypes.POINTER(ctypes.c_int),  # count
+            c_double_p,  # linear_momentum / angular_momentum
+            c_double_p,  # sol_state
+            ctypes.POINTER(ctypes.c_bool),  # is_exit
+        ]
 
 
 def trim_data(
@@ -190,11 +305,26 @@ def trim_data(
     -------
     trimmed_data : int | np.ndarray
         Trimmed data
+
+    Notes
+    -----
+    Arrays are trimmed with a single strided slice, which is then copied
+    into a new contiguous array. The copy releases the untrimmed data and
+    keeps the result safe to pass to the C library, which expects
+    contiguous arrays. The last data point is always kept, so that the
+    trimmed data still ends at the final state of the simulation.
+    Integers (data sizes) are trimmed to the length of the trimmed arrays.
     """
     if isinstance(data, int):
-        return data // trim_freq
+        trimmed_size = (data + trim_freq - 1) // trim_freq
+        if data > 0 and (data - 1) % trim_freq != 0:
+            trimmed_size += 1
+        return trimmed_size
     elif isinstance(data, np.ndarray):
-        return data[::trim_freq]
+        data_size = len(data)
+        if data_size > 0 and (data_size - 1) % trim_freq != 0:
+            return np.concatenate((data[::trim_freq], data[-1:]))
+        return np.ascontiguousarray(data[::trim_freq])
     else:
         raise TypeError("Data type not supported.")
 
@@ -204,7 +334,7 @@ def save_results_csv(
     sol_state_: np.ndarray,
     sol_time_: np.ndarray,
     sol_dt_: np.ndarray,
-    sol_energy_: np.ndarray,
+    sol_energy_: Optional[np.ndarray],
     disable_progress_bar: bool = False,
 ) -> None:
     """Save simulation results to a CSV file
@@ -224,8 +354,9 @@ def save_results_csv(
         Time at each time step
     sol_dt_ : np.ndarray
         Time step at each time step
-    sol_energy_ : np.ndarray
-        Energy of the system at each time step
+    sol_energy_ : np.ndarray, optional
+        Energy of the system at each time step. If None, zeros are
+        written in the energy column
     disable_progress_bar : bool, optional
         Disable progress bar, by default False
     """
@@ -233,36 +364,42 @@ def save_results_csv(
         file_path = Path(file_path)
 
     data_size = len(sol_state_)
-    if not disable_progress_bar:
-        print("Saving results to CSV file...")
-        start = timeit.default_timer()
-        progress_bar = Progress_bar()
-        with progress_bar:
-            with file_path.open("w", newline="") as file:
-                writer = csv.writer(file)
-                for count in progress_bar.track(range(data_size)):
-                    row = np.insert(
-                        sol_state_[count],
-                        0,
-                        sol_energy_[count],
-                    )
-                    row = np.insert(row, 0, sol_dt_[count])
-                    row = np.insert(row, 0, sol_time_[count])
-                    writer.writerow(row.tolist())
-        end = timeit.default_timer()
-        print(f"Run time: {end - start:.2f} s")
-    else:
-        with file_path.open("w", newline="") as file:
-            writer = csv.writer(file)
-            for count in range(data_size):
-                row = np.insert(
-                    sol_state_[count],
-                    0,
-                    sol_energy_[count],
-                )
-                row = np.insert(row, 0, sol_dt_[count])
-                row = np.insert(row, 0, sol_time_[count])
-                writer.writerow(row.tolist())
+
+    # Write the rows in batches with numpy's formatter. The rows of each
+    # batch are assembled in one pre-allocated buffer, instead of copying
+    # the whole solution into a new array. The file is opened with a
+    # large buffer, so that the batches are flushed in few system calls.
+    # 17 significant digits are enough to round trip double precision.
+    batch_size = 4096
+    buffer = np.empty((min(batch_size, data_size), 3 + sol_state_.shape[1]))
+
+    def write_batch(file, start_idx: int) -> None:
+        end_idx = min(start_idx + batch_size, data_size)
+        rows = buffer[: (end_idx - start_idx)]
+        rows[:, 0] = sol_time_[start_idx:end_idx]
+        rows[:, 1] = sol_dt_[start_idx:end_idx]
+        if sol_energy_ is None:
+            rows[:, 2] = 0.0
+        else:
+            rows[:, 2] = sol_energy_[start_idx:end_idx]
+        rows[:, 3:] = sol_state_[start_idx:end_idx]
+        np.savetxt(file, rows, fmt="%.17g", delimiter=",")
+
+    # All the batches are streamed through a single open file handle,
+    # with or without the progress bar
+    batch_starts = range(0, data_size, batch_size)
+    with file_path.open("w", buffering=1 << 20) as file:
+        if disable_progress_bar:
+            for i in batch_starts:
+                write_batch(file, i)
+        else:
+            print("Saving results to CSV file...")
+            start = timeit.default_timer()
+            with Progress_bar() as progress_bar:
+                for i in progress_bar.track(batch_starts):
+                    write_batch(file, i)
+            end = timeit.default_timer()
+            print(f"Run time: {end - start:.2f} s")
 
 
 def read_results_csv(
@@ -291,58 +428,64 @@ def read_results_csv(
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    time = []
-    dt = []
-    energy = []
-    state = []
-
-    with file_path.open("r") as file:
-        reader = csv.reader(file)
-        for row in reader:
-            time.append(float(row[0]))
-            dt.append(float(row[1]))
-            energy.append(float(row[2]))
-            state.append(np.array(row[3:], dtype=float))
+    # Parse all the rows at once with numpy's reader instead of converting
+    # each field of each row in Python. Lines starting with "#" (e.g. a
+    # metadata header) are skipped as comments.
+    data = np.loadtxt(file_path, dtype=np.float64, delimiter=",", comments="#", ndmin=2)
 
+    # Split the columns into contiguous arrays
     results = {
-        "time": np.array(time),
-        "dt": np.array(dt),
-        "energy": np.array(energy),
-        "state": np.array(state),
+        "time": data[:, 0].copy(),
+        "dt": data[:, 1].copy(),
+        "energy": data[:, 2].copy(),
+        "state": np.ascontiguousarray(data[:, 3:]),
     }
 
     return results
 
 
 def keplerian_to_cartesian(
-    semi_major_axis: float,
-    eccentricity: float,
-    inclination: float,
-    argument_of_periapsis: float,
-    longitude_of_ascending_node: float,
-    true_anomaly: float,
-    total_mass: float,
+    semi_major_axis: float | np.ndarray,
+    eccentricity: float | np.ndarray,
+    inclination: float | np.ndarray,
+    argument_of_periapsis: float | np.ndarray,
+    longitude_of_ascending_node: float | np.ndarray,
+    true_anomaly: float | np.ndarray,
+    total_mass: float | np.ndarray,
     G: float,
 ) -> tuple[np.ndarray, np.ndarray]:
     """
     Convert keplerian elements to cartesian coordinates
 
+    The elements may be scalars or arrays of the same shape, in which
+    case the conversion is vectorized over all objects at once.
+
     Parameters
     ----------
-    semi_major_axis : float
-    eccentricity : float
-    inclination : float
-    argument_of_periapsis : float
-    longitude_of_ascending_node : float
-    true_anomaly : float
-    total_mass : float
+    semi_major_axis : float | np.ndarray
+    eccentricity : float | np.ndarray
+    inclination : float | np.ndarray
+    argument_of_periapsis : float | np.ndarray
+    longitude_of_ascending_node : float | np.ndarray
+    true_anomaly : float | np.ndarray
+    total_mass : float | np.ndarray
     G : float
 
+    Returns
+    -------
+    x : np.ndarray
+        Position vector(s), with shape (3,) for scalar inputs
+        or (N, 3) for array inputs of length N
+    v : np.ndarray
+        Velocity vector(s), with the same shape as x
+
     Reference
     ---------
     Moving Planets Around: An Introduction to N-Body
     Simulations Applied to Exoplanetary Systems, Chapter 2
     """
+    semi_major_axis = np.asarray(semi_major_axis, dtype=np.float64)
+    eccentricity = np.asarray(eccentricity, dtype=np.float64)
 
     cos_inc = np.cos(inclination)
     sin_inc = np.sin(inclination)
@@ -357,39 +500,44 @@ def keplerian_to_cartesian(
     sin_true_anomaly = np.sin(true_anomaly)
 
     # ecc_unit_vec is the unit vector pointing towards periapsis
-    ecc_unit_vec = np.zeros(3)
-    ecc_unit_vec[0] = (
-        cos_long_asc_node * cos_arg_periapsis
-        - sin_long_asc_node * sin_arg_periapsis * cos_inc
-    )
-    ecc_unit_vec[1] = (
-        sin_long_asc_node * cos_arg_periapsis
-        + cos_long_asc_node * sin_arg_periapsis * cos_inc
+    ecc_unit_vec = np.stack(
+        np.broadcast_arrays(
+            cos_long_asc_node * cos_arg_periapsis
+            - sin_long_asc_node * sin_arg_periapsis * cos_inc,
+            sin_long_asc_node * cos_arg_periapsis
+            + cos_long_asc_node * sin_arg_periapsis * cos_inc,
+            sin_arg_periapsis * sin_inc,
+        ),
+        axis=-1,
     )
-    ecc_unit_vec[2] = sin_arg_periapsis * sin_inc
 
     # q_unit_vec is the unit vector that is perpendicular to ecc_unit_vec and orbital angular momentum vector
-    q_unit_vec = np.zeros(3)
-    q_unit_vec[0] = (
-        -cos_long_asc_node * sin_arg_periapsis
-        - sin_long_asc_node * cos_arg_periapsis * cos_inc
+    q_unit_vec = np.stack(
+        np.broadcast_arrays(
+            -cos_long_asc_node * sin_arg_periapsis
+            - sin_long_asc_node * cos_arg_periapsis * cos_inc,
+            -sin_long_asc_node * sin_arg_periapsis
+            + cos_long_asc_node * cos_arg_periapsis * cos_inc,
+            cos_arg_periapsis * sin_inc,
+        ),
+        axis=-1,
     )
-    q_unit_vec[1] = (
-        -sin_long_asc_node * sin_arg_periapsis
-        + cos_long_asc_node * cos_arg_periapsis * cos_inc
-    )
-    q_unit_vec[2] = cos_arg_periapsis * sin_inc
+
+    # 1 - e^2 is needed for both x and v, so compute it once
+    one_minus_ecc_sq = 1.0 - eccentricity * eccentricity
 
     # Calculate the position vector
-    x = (
-        semi_major_axis
-        * (1.0 - eccentricity**2)
-        / (1.0 + eccentricity * cos_true_anomaly)
-        * (cos_true_anomaly * ecc_unit_vec + sin_true_anomaly * q_unit_vec)
+    x = (semi_major_axis * one_minus_ecc_sq / (1.0 + eccentricity * cos_true_anomaly))[
+        ..., np.newaxis
+    ] * (
+        np.asarray(cos_true_anomaly)[..., np.newaxis] * ecc_unit_vec
+        + np.asarray(sin_true_anomaly)[..., np.newaxis] * q_unit_vec
     )
-    v = np.sqrt(G * total_mass / (semi_major_axis * (1.0 - eccentricity**2))) * (
-        -sin_true_anomaly * ecc_unit_vec
-        + (eccentricity + cos_true_anomaly) * q_unit_vec
+    v = np.sqrt(G * total_mass / (semi_major_axis * one_minus_ecc_sq))[
+        ..., np.newaxis
+    ] * (
+        -np.asarray(sin_true_anomaly)[..., np.newaxis] * ecc_unit_vec
+        + np.asarray(eccentricity + cos_true_anomaly)[..., np.newaxis] * q_unit_vec
     )
 
     if np.isnan(x).any() or np.isnan(v).any():
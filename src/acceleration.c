@@ -185,16 +185,20 @@ IN_FILE int acceleration_massless(
         }
     }
 
-    /* Find the indices of massive and massless objects */
-    int *restrict massive_indices = malloc(massive_objects_count * sizeof(int));
-    int *restrict massless_indices = malloc(massless_objects_count * sizeof(int));
-    massive_objects_count = 0;
-    massless_objects_count = 0;
-
-    if (massive_indices == NULL || massless_indices == NULL)
+    /*
+     * Find the indices of massive and massless objects. Both lists
+     * share one allocation, with the massless indices stored after
+     * the massive ones, so that only one buffer is allocated per call
+     */
+    int *restrict indices = malloc(objects_count * sizeof(int));
+    if (indices == NULL)
     {
         goto malloc_error;
     }
+    int *restrict massive_indices = indices;
+    int *restrict massless_indices = indices + massive_objects_count;
+    massive_objects_count = 0;
+    massless_objects_count = 0;
 
     for (int i = 0; i < objects_count; i++)
     {
@@ -248,19 +252,29 @@ IN_FILE int acceleration_massless(
     }
 
     /* Acceleration calculation for massless objects due to massive objects */
-    for (int i = 0; i < massive_objects_count; i++)
+    // Each massless object only receives acceleration, so the outer loop is
+    // independent and can be run in parallel when compiled with OpenMP
+#ifdef _OPENMP
+    #pragma omp parallel for schedule(static)
+#endif
+    for (int i = 0; i < massless_objects_count; i++)
     {
-        for (int j = 0; j < massless_objects_count; j++)
+        const int idx_i = massless_indices[i];
+        const real x_i = x[idx_i * 3 + 0];
+        const real y_i = x[idx_i * 3 + 1];
+        const real z_i = x[idx_i * 3 + 2];
+        real a_i[3] = {0.0, 0.0, 0.0};
+
+        for (int j = 0; j < massive_objects_count; j++)
         {
-            int idx_i = massive_indices[i];
-            int idx_j = massless_indices[j];
+            const int idx_j = massive_indices[j];
             real R[3];
 
             // Calculate \vec{R} and its norm
-            R[0] = x[idx_i * 3 + 0] - x[idx_j * 3 + 0];
-            R[1] = x[idx_i * 3 + 1] - x[idx_j * 3 + 1];
-            R[2] = x[idx_i * 3 + 2] - x[idx_j * 3 + 2];
-            real R_norm = sqrt(
+            R[0] = x[idx_j * 3 + 0] - x_i;
+            R[1] = x[idx_j * 3 + 1] - y_i;
+            R[2] = x[idx_j * 3 + 2] - z_i;
+            const real R_norm = sqrt(
                 R[0] * R[0] + 
                 R[1] * R[1] + 
                 R[2] * R[2] +
@@ -268,20 +282,21 @@ IN_FILE int acceleration_massless(
             );
 
             // Calculate the acceleration
-            real temp_value = G / (R_norm * R_norm * R_norm);
-            a[idx_j * 3 + 0] += temp_value * R[0] * m[i];
-            a[idx_j * 3 + 1] += temp_value * R[1] * m[i];
-            a[idx_j * 3 + 2] += temp_value * R[2] * m[i];
+            const real temp_value = G * m[idx_j] / (R_norm * R_norm * R_norm);
+            a_i[0] += temp_value * R[0];
+            a_i[1] += temp_value * R[1];
+            a_i[2] += temp_value * R[2];
         }
+
+        a[idx_i * 3 + 0] = a_i[0];
+        a[idx_i * 3 + 1] = a_i[1];
+        a[idx_i * 3 + 2] = a_i[2];
     }
 
-    free(massive_indices);
-    free(massless_indices);
+    free(indices);
 
     return SUCCESS;
 
 malloc_error:
-    free(massive_indices);
-    free(massless_indices);
     return ERROR_ACCELERATION_MASSLESS_MEMORY_ALLOC;
 }
@@ -14,19 +14,58 @@
 // );
 
 /**
- * \brief Check if the integrator is a fixed step size integrator
+ * \brief Function pointer type of the integrators
+ */
+typedef int (*IntegratorFunction)(
+    System *system,
+    IntegratorParam *integrator_param,
+    AccelerationParam *acceleration_param,
+    StoringParam *storing_param,
+    Solutions *solutions,
+    SimulationStatus *simulation_status,
+    Settings *settings,
+    SimulationParam *simulation_param
+);
+
+/**
+ * \brief Entry of the integrators lookup table
+ */
+typedef struct IntegratorEntry
+{
+    const char *name;
+    IntegratorFunction function;
+    bool is_fixed_step_size;
+} IntegratorEntry;
+
+/**
+ * \brief Available integrators, with their functions and whether
+ *        they are fixed step size integrators
+ */
+IN_FILE const IntegratorEntry INTEGRATORS[] = {
+    {"euler", euler, true},
+    {"euler_cromer", euler_cromer, true},
+    {"rk4", rk4, true},
+    {"leapfrog", leapfrog, true},
+    {"whfast", whfast, true},
+    {"rkf45", rk_embedded, false},
+    {"dopri", rk_embedded, false},
+    {"dverk", rk_embedded, false},
+    {"rkf78", rk_embedded, false},
+    {"ias15", ias15, false},
+};
+
+/**
+ * \brief Look up an integrator by name
  * 
  * \param integrator Name of the integrator
- * \param is_fixed_step_size_integrator Pointer to the flag that indicates
- *                                      whether the integrator is a fixed 
- *                                      step size integrator
+ * \param integrator_entry Pointer to the integrator entry to be updated
  * 
  * \retval SUCCESS If the integrator is recognized
  * \retval ERROR_UNKNOWN_INTEGRATOR_METHOD If the integrator is not recognized
  */
-IN_FILE int check_is_fixed_step_size_integrator(
+IN_FILE int get_integrator_entry(
     const char *restrict integrator,
-    bool *restrict is_fixed_step_size_integrator
+    const IntegratorEntry **restrict integrator_entry
 );
 
 /**
@@ -222,37 +261,22 @@ error:
     return ERROR_SIMULATION_FAILURE;
 }
 
-IN_FILE int check_is_fixed_step_size_integrator(
+IN_FILE int get_integrator_entry(
     const char *restrict integrator,
-    bool *restrict is_fixed_step_size_integrator
+    const IntegratorEntry **restrict integrator_entry
 )
 {
-    if (
-        strcmp(integrator, "euler") == 0
-        || strcmp(integrator, "euler_cromer") == 0
-        || strcmp(integrator, "rk4") == 0
-        || strcmp(integrator, "leapfrog") == 0
-        || strcmp(integrator, "whfast") == 0
-    )
-    {
-        *is_fixed_step_size_integrator = true;
-        return SUCCESS;
-    }
-    else if (
-        strcmp(integrator, "rkf45") == 0
-        || strcmp(integrator, "dopri") == 0
-        || strcmp(integrator, "dverk") == 0
-        || strcmp(integrator, "rkf78") == 0
-        || strcmp(integrator, "ias15") == 0
-    )
-    {
-        *is_fixed_step_size_integrator = false;
-        return SUCCESS;
-    }
-    else
+    const int integrators_count = sizeof(INTEGRATORS) / sizeof(INTEGRATORS[0]);
+    for (int i = 0; i < integrators_count; i++)
     {
-        return ERROR_UNKNOWN_INTEGRATOR_METHOD;
+        if (strcmp(integrator, INTEGRATORS[i].name) == 0)
+        {
+            *integrator_entry = &INTEGRATORS[i];
+            return SUCCESS;
+        }
     }
+
+    return ERROR_UNKNOWN_INTEGRATOR_METHOD;
 }
 
 IN_FILE int _launch_simulation(
@@ -268,17 +292,19 @@ IN_FILE int _launch_simulation(
 {
     int return_code = SUCCESS;
 
-    bool is_fixed_step_size_integrator;
-    return_code = check_is_fixed_step_size_integrator(
+    // The integrator is looked up once, for both its step size type
+    // and the function to launch
+    const IntegratorEntry *integrator_entry = NULL;
+    return_code = get_integrator_entry(
         integrator_param->integrator,
-        &is_fixed_step_size_integrator
+        &integrator_entry
     );
     if (return_code != SUCCESS)
     {
         goto error;
     }
 
-    if (is_fixed_step_size_integrator)
+    if (integrator_entry->is_fixed_step_size)
     {
         // Number of time steps
         simulation_param->n_steps_ = simulation_param->tf / integrator_param->dt;
@@ -337,55 +363,7 @@ IN_FILE int _launch_simulation(
     }
 
     // Launch simulation
-    int (*integrator)(
-        System *system,
-        IntegratorParam *integrator_param,
-        AccelerationParam *acceleration_param,
-        StoringParam *storing_param,
-        Solutions *solutions,
-        SimulationStatus *simulation_status,
-        Settings *settings,
-        SimulationParam *simulation_param
-    );
-
-    if (strcmp(integrator_param->integrator, "euler") == 0)
-    {
-        integrator = euler;
-    }
-    else if (strcmp(integrator_param->integrator, "euler_cromer") == 0)
-    {
-        integrator = euler_cromer;
-    }
-    else if (strcmp(integrator_param->integrator, "rk4") == 0)
-    {
-        integrator = rk4;
-    }
-    else if (strcmp(integrator_param->integrator, "leapfrog") == 0)
-    {
-        integrator = leapfrog;
-    }
-    else if (
-        strcmp(integrator_param->integrator, "rkf45") == 0
-        || strcmp(integrator_param->integrator, "dopri") == 0
-        || strcmp(integrator_param->integrator, "dverk") == 0
-        || strcmp(integrator_param->integrator, "rkf78") == 0
-    )
-    {
-        integrator = rk_embedded;
-    }
-    else if (strcmp(integrator_param->integrator, "ias15") == 0)
-    {
-        integrator = ias15;
-    }
-    else if (strcmp(integrator_param->integrator, "whfast") == 0)
-    {
-        integrator = whfast;
-    }
-    else
-    {
-        return_code = ERROR_UNKNOWN_INTEGRATOR_METHOD;
-        goto error;
-    }
+    const IntegratorFunction integrator = integrator_entry->function;
 
     clock_t start_time;
     clock_t end_time;
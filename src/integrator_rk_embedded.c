@@ -61,6 +61,104 @@ IN_FILE int get_rk_embedded_order(
     }
 }
 
+/*
+ * Butcher tableaus of the Embedded RK integrators, stored once as
+ * constant tables instead of being allocated and copied for every
+ * simulation
+ */
+
+// RUNGE-KUTTA-FEHLBERG 4(5)
+// nodes = np.array([1.0 / 4.0, 3.0 / 8.0, 12.0 / 13.0, 1.0, 0.5])
+IN_FILE const real RKF45_COEFF[25] = {
+    1.0L / 4.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    3.0L / 32.0L, 9.0L / 32.0L, 0.0L, 0.0L, 0.0L,
+    1932.0L / 2197.0L, -7200.0L / 2197.0L, 7296.0L / 2197.0L, 0.0L, 0.0L,
+    439.0L / 216.0L, -8.0L, 3680.0L / 513.0L, -845.0L / 4104.0L, 0.0L,
+    -8.0L / 27.0L, 2.0L, -3544.0L / 2565.0L, 1859.0L / 4104.0L, -11.0L / 40.0L
+};
+IN_FILE const real RKF45_WEIGHTS[6] = {
+    25.0L / 216.0L, 0.0L, 1408.0L / 2565.0L, 2197.0L / 4104.0L, -0.2L, 0.0L
+};
+IN_FILE const real RKF45_WEIGHTS_TEST[6] = {
+    16.0L / 135.0L, 0.0L, 6656.0L / 12825.0L, 28561.0L / 56430.0L, -9.0L / 50.0L, 2.0L / 55.0L
+};
+
+// DORMAND-PRINCE 5(4)
+// nodes = np.array([1.0 / 5.0, 3.0 / 10.0, 4.0 / 5.0, 8.0 / 9.0, 1.0, 1.0])
+IN_FILE const real DOPRI_COEFF[36] = {
+    1.0L / 5.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    3.0L / 40.0L, 9.0L / 40.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    44.0L / 45.0L, -56.0L / 15.0L, 32.0L / 9.0L, 0.0L, 0.0L, 0.0L,
+    19372.0L / 6561.0L, -25360.0L / 2187.0L, 64448.0L / 6561.0L, -212.0L / 729.0L, 0.0L, 0.0L,
+    9017.0L / 3168.0L, -355.0L / 33.0L, 46732.0L / 5247.0L, 49.0L / 176.0L, -5103.0L / 18656.0L, 0.0L,
+    35.0L / 384.0L, 0.0L, 500.0L / 1113.0L, 125.0L / 192.0L, -2187.0L / 6784.0L, 11.0L / 84.0L
+};
+IN_FILE const real DOPRI_WEIGHTS[7] = {
+    35.0L / 384.0L, 0.0L, 500.0L / 1113.0L, 125.0L / 192.0L, -2187.0L / 6784.0L, 11.0L / 84.0L, 0.0L
+};
+IN_FILE const real DOPRI_WEIGHTS_TEST[7] = {
+    5179.0L / 57600.0L, 0.0L, 7571.0L / 16695.0L, 393.0L / 640.0L, -92097.0L / 339200.0L, 187.0L / 2100.0L, 1.0L / 40.0L
+};
+
+// RUNGE-KUTTA-FEHLBERG 7(8)
+// nodes = np.array(
+//     [
+//         2.0 / 27.0,
+//         1.0 / 9.0,
+//         1.0 / 6.0,
+//         5.0 / 12.0,
+//         1.0 / 2.0,
+//         5.0 / 6.0,
+//         1.0 / 6.0,
+//         2.0 / 3.0,
+//         1.0 / 3.0,
+//         1.0,
+//         0.0,
+//         1.0,
+//     ]
+// )
+IN_FILE const real RKF78_COEFF[144] = {
+    2.0L / 27.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    1.0L / 36.0L, 1.0L / 12.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    1.0L / 24.0L, 0.0L, 1.0L / 8.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    5.0L / 12.0L, 0.0L, -25.0L / 16.0L, 25.0L / 16.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    1.0L / 20.0L, 0.0L, 0.0L, 1.0L / 4.0L, 1.0L / 5.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    -25.0L / 108.0L, 0.0L, 0.0L, 125.0L / 108.0L, -65.0L / 27.0L, 125.0L / 54.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    31.0L / 300.0L, 0.0L, 0.0L, 0.0L, 61.0L / 225.0L, -2.0L / 9.0L, 13.0L / 900.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    2.0L, 0.0L, 0.0L, -53.0L / 6.0L, 704.0L / 45.0L, -107.0L / 9.0L, 67.0L / 90.0L, 3.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    -91.0L / 108.0L, 0.0L, 0.0L, 23.0L / 108.0L, -976.0L / 135.0L, 311.0L / 54.0L, -19.0L / 60.0L, 17.0L / 6.0L, -1.0L / 12.0L, 0.0L, 0.0L, 0.0L,
+    2383.0L / 4100.0L, 0.0L, 0.0L, -341.0L / 164.0L, 4496.0L / 1025.0L, -301.0L / 82.0L, 2133.0L / 4100.0L, 45.0L / 82.0L, 45.0L / 164.0L, 18.0L / 41.0L, 0.0L, 0.0L,
+    3.0L / 205.0L, 0.0L, 0.0L, 0.0L, 0.0L, -6.0L / 41.0L, -3.0L / 205.0L, -3.0L / 41.0L, 3.0L / 41.0L, 6.0L / 41.0L, 0.0L, 0.0L,
+    -1777.0L / 4100.0L, 0.0L, 0.0L, -341.0L / 164.0L, 4496.0L / 1025.0L, -289.0L / 82.0L, 2193.0L / 4100.0L, 51.0L / 82.0L, 33.0L / 164.0L, 19.0L / 41.0L, 0.0L, 1.0L
+};
+IN_FILE const real RKF78_WEIGHTS[13] = {
+    41.0L / 840.0L, 0.0L, 0.0L, 0.0L, 0.0L, 34.0L / 105.0L, 9.0L / 35.0L, 9.0L / 35.0L, 9.0L / 280.0L, 9.0L / 280.0L, 41.0L / 840.0L, 0.0L, 0.0L
+};
+IN_FILE const real RKF78_WEIGHTS_TEST[13] = {
+    0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 34.0L / 105.0L, 9.0L / 35.0L, 9.0L / 35.0L, 9.0L / 280.0L, 9.0L / 280.0L, 0.0L, 41.0L / 840.0L, 41.0L / 840.0L
+};
+
+// VERNER 6(5) DVERK
+/* nodes = np.array(
+*     [1.0 / 6.0, 4.0 / 15.0, 2.0 / 3.0, 5.0 / 6.0, 1.0, 1.0 / 15.0, 1.0]
+* )
+*/
+IN_FILE const real DVERK_COEFF[49] = {
+    1.0L / 6.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    4.0L / 75.0L, 16.0L / 75.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    5.0L / 6.0L, -8.0L / 3.0L, 5.0L / 2.0L, 0.0L, 0.0L, 0.0L, 0.0L,
+    -165.0L / 64.0L, 55.0L / 6.0L, -425.0L / 64.0L, 85.0L / 96.0L, 0.0L, 0.0L, 0.0L,
+    12.0L / 5.0L, -8.0L, 4015.0L / 612.0L, -11.0L / 36.0L, 88.0L / 255.0L, 0.0L, 0.0L,
+    -8263.0L / 15000.0L, 124.0L / 75.0L, -643.0L / 680.0L, -81.0L / 250.0L, 2484.0L / 10625.0L, 0.0L, 0.0L,
+    3501.0L / 1720.0L, -300.0L / 43.0L, 297275.0L / 52632.0L, -319.0L / 2322.0L, 24068.0L / 84065.0L, 0.0L, 3850.0L / 26703.0L
+};
+IN_FILE const real DVERK_WEIGHTS[8] = {
+    3.0L / 40.0L, 0.0L, 875.0L / 2244.0L, 23.0L / 72.0L, 264.0L / 1955.0L, 0.0L, 125.0L / 11592.0L, 43.0L / 616.0L
+};
+IN_FILE const real DVERK_WEIGHTS_TEST[8] = {
+    13.0L / 160.0L, 0.0L, 2375.0L / 5984.0L, 5.0L / 16.0L, 12.0L / 85.0L, 3.0L / 44.0L, 0.0L, 0.0L
+};
+
 /**
  * \brief Butcher tableaus for Embedded RK integrator
  * 
@@ -72,20 +170,20 @@ IN_FILE int get_rk_embedded_order(
  * \param weights Pointer to the array of weights for RK integrator
  * \param weights_test Pointer to the array of weights for error calculation
  * 
+ * \note The arrays point to the constant tables above and must not be freed
+ * 
  * \retval SUCCESS If successful
  * \retval ERROR_RK_EMBEDDED_BUTCHER_TABLEAUS_UNKNOWN_ORDER
  *         If order is not one of 45 / 54 / 78 / 65
- * \retval ERROR_RK_EMBEDDED_BUTCHER_TABLEAUS_MEMORY_ALLOC 
- *         If failed to allocate memory for coeff, weights and weights_test
  */
 IN_FILE int rk_embedded_butcher_tableaus(
     const int order,
     int *restrict power,
     int *restrict power_test,
-    real **coeff,
+    const real **coeff,
     int *restrict len_weights,
-    real **weights,
-    real **weights_test
+    const real **weights,
+    const real **weights_test
 )
 {
     /*  
@@ -95,227 +193,51 @@ IN_FILE int rk_embedded_butcher_tableaus(
     *   78) Runge-Kutta-Fehlberg 7(8)
     *   65) Verner's method 6(5), DVERK
     */
-
-    int return_code;
-    *coeff = NULL;
-    *weights = NULL;
-    *weights_test = NULL;
-
     switch (order)
     {
         // RUNGE-KUTTA-FEHLBERG 4(5)
         case 45:
-            // Order
             *power = 4;
             *power_test = 5;
-            // nodes = np.array([1.0 / 4.0, 3.0 / 8.0, 12.0 / 13.0, 1.0, 0.5])
-            *coeff = malloc(25 * sizeof(real));
             *len_weights = 6;
-            *weights = malloc(*len_weights * sizeof(real));
-            *weights_test = malloc(6 * sizeof(real));
-            if (!*coeff || !*weights || !*weights_test)
-            {
-                goto error_memory;
-            }
-            memcpy(
-                *coeff,
-                (real [25]) {
-                    1.0L / 4.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    3.0L / 32.0L, 9.0L / 32.0L, 0.0L, 0.0L, 0.0L,
-                    1932.0L / 2197.0L, -7200.0L / 2197.0L, 7296.0L / 2197.0L, 0.0L, 0.0L,
-                    439.0L / 216.0L, -8.0L, 3680.0L / 513.0L, -845.0L / 4104.0L, 0.0L,
-                    -8.0L / 27.0L, 2.0L, -3544.0L / 2565.0L, 1859.0L / 4104.0L, -11.0L / 40.0L
-                },
-                25 * sizeof(real)
-            );
-            memcpy(
-                *weights,
-                (real [6]) {
-                    25.0L / 216.0L, 0.0L, 1408.0L / 2565.0L, 2197.0L / 4104.0L, -0.2L, 0.0L
-                },
-                6 * sizeof(real)
-            );
-            memcpy(
-                *weights_test,
-                (real [6]) {
-                    16.0L / 135.0L, 0.0L, 6656.0L / 12825.0L, 28561.0L / 56430.0L, -9.0L / 50.0L, 2.0L / 55.0L
-                },
-                6 * sizeof(real)
-            );
-
-            break;
+            *coeff = RKF45_COEFF;
+            *weights = RKF45_WEIGHTS;
+            *weights_test = RKF45_WEIGHTS_TEST;
+            return SUCCESS;
 
         // DORMAND-PRINCE 5(4)
         case 54:
-            // order
             *power = 5;
             *power_test = 4;
-            // nodes = np.array([1.0 / 5.0, 3.0 / 10.0, 4.0 / 5.0, 8.0 / 9.0, 1.0, 1.0])
-            *coeff = malloc(36 * sizeof(real));
             *len_weights = 7;
-            *weights = malloc(*len_weights * sizeof(real));
-            *weights_test = malloc(7 * sizeof(real));
-
-            if (!*coeff || !*weights || !*weights_test)
-            {
-                goto error_memory;
-            }
-
-            memcpy(
-                *coeff,
-                (real [36]) {
-                    1.0L / 5.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    3.0L / 40.0L, 9.0L / 40.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    44.0L / 45.0L, -56.0L / 15.0L, 32.0L / 9.0L, 0.0L, 0.0L, 0.0L,
-                    19372.0L / 6561.0L, -25360.0L / 2187.0L, 64448.0L / 6561.0L, -212.0L / 729.0L, 0.0L, 0.0L,
-                    9017.0L / 3168.0L, -355.0L / 33.0L, 46732.0L / 5247.0L, 49.0L / 176.0L, -5103.0L / 18656.0L, 0.0L,
-                    35.0L / 384.0L, 0.0L, 500.0L / 1113.0L, 125.0L / 192.0L, -2187.0L / 6784.0L, 11.0L / 84.0L
-                },
-                36 * sizeof(real)
-            );
-            memcpy(
-                *weights,
-                (real [7]) {
-                    35.0L / 384.0L, 0.0L, 500.0L / 1113.0L, 125.0L / 192.0L, -2187.0L / 6784.0L, 11.0L / 84.0L, 0.0L
-                },
-                7 * sizeof(real)
-            );
-            memcpy(
-                *weights_test,
-                (real [7]) {
-                    5179.0L / 57600.0L, 0.0L, 7571.0L / 16695.0L, 393.0L / 640.0L, -92097.0L / 339200.0L, 187.0L / 2100.0L, 1.0L / 40.0L
-                },
-                7 * sizeof(real)
-            );
-
-            break;
+            *coeff = DOPRI_COEFF;
+            *weights = DOPRI_WEIGHTS;
+            *weights_test = DOPRI_WEIGHTS_TEST;
+            return SUCCESS;
 
         // RUNGE-KUTTA-FEHLBERG 7(8)
         case 78:
-            // Order
             *power = 7;
             *power_test = 8;
-            // nodes = np.array(
-            //     [
-            //         2.0 / 27.0,
-            //         1.0 / 9.0,
-            //         1.0 / 6.0,
-            //         5.0 / 12.0,
-            //         1.0 / 2.0,
-            //         5.0 / 6.0,
-            //         1.0 / 6.0,
-            //         2.0 / 3.0,
-            //         1.0 / 3.0,
-            //         1.0,
-            //         0.0,
-            //         1.0,
-            //     ]
-            // )
-            
-            *coeff = malloc(144 * sizeof(real));
             *len_weights = 13;
-            *weights = malloc(*len_weights * sizeof(real));
-            *weights_test = malloc(13 * sizeof(real));
-            if (!*coeff || !*weights || !*weights_test)
-            {
-                goto error_memory;
-            }
-
-            memcpy(
-                *coeff,
-                (real [144]) {
-                    2.0L / 27.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    1.0L / 36.0L, 1.0L / 12.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    1.0L / 24.0L, 0.0L, 1.0L / 8.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    5.0L / 12.0L, 0.0L, -25.0L / 16.0L, 25.0L / 16.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    1.0L / 20.0L, 0.0L, 0.0L, 1.0L / 4.0L, 1.0L / 5.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    -25.0L / 108.0L, 0.0L, 0.0L, 125.0L / 108.0L, -65.0L / 27.0L, 125.0L / 54.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    31.0L / 300.0L, 0.0L, 0.0L, 0.0L, 61.0L / 225.0L, -2.0L / 9.0L, 13.0L / 900.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    2.0L, 0.0L, 0.0L, -53.0L / 6.0L, 704.0L / 45.0L, -107.0L / 9.0L, 67.0L / 90.0L, 3.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    -91.0L / 108.0L, 0.0L, 0.0L, 23.0L / 108.0L, -976.0L / 135.0L, 311.0L / 54.0L, -19.0L / 60.0L, 17.0L / 6.0L, -1.0L / 12.0L, 0.0L, 0.0L, 0.0L,
-                    2383.0L / 4100.0L, 0.0L, 0.0L, -341.0L / 164.0L, 4496.0L / 1025.0L, -301.0L / 82.0L, 2133.0L / 4100.0L, 45.0L / 82.0L, 45.0L / 164.0L, 18.0L / 41.0L, 0.0L, 0.0L,
-                    3.0L / 205.0L, 0.0L, 0.0L, 0.0L, 0.0L, -6.0L / 41.0L, -3.0L / 205.0L, -3.0L / 41.0L, 3.0L / 41.0L, 6.0L / 41.0L, 0.0L, 0.0L,
-                    -1777.0L / 4100.0L, 0.0L, 0.0L, -341.0L / 164.0L, 4496.0L / 1025.0L, -289.0L / 82.0L, 2193.0L / 4100.0L, 51.0L / 82.0L, 33.0L / 164.0L, 19.0L / 41.0L, 0.0L, 1.0L
-                },
-                144 * sizeof(real)
-            );
-            memcpy(
-                *weights,
-                (real [13]) {
-                    41.0L / 840.0L, 0.0L, 0.0L, 0.0L, 0.0L, 34.0L / 105.0L, 9.0L / 35.0L, 9.0L / 35.0L, 9.0L / 280.0L, 9.0L / 280.0L, 41.0L / 840.0L, 0.0L, 0.0L
-                },
-                13 * sizeof(real)
-            );
-            memcpy(
-                *weights_test,
-                (real [13]) {
-                    0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 34.0L / 105.0L, 9.0L / 35.0L, 9.0L / 35.0L, 9.0L / 280.0L, 9.0L / 280.0L, 0.0L, 41.0L / 840.0L, 41.0L / 840.0L
-                },
-                13 * sizeof(real)
-            );
-
-            break;
+            *coeff = RKF78_COEFF;
+            *weights = RKF78_WEIGHTS;
+            *weights_test = RKF78_WEIGHTS_TEST;
+            return SUCCESS;
 
         // VERNER 6(5) DVERK
         case 65:
-            // Order
             *power = 6;
             *power_test = 7;
-            /* nodes = np.array(
-            *     [1.0 / 6.0, 4.0 / 15.0, 2.0 / 3.0, 5.0 / 6.0, 1.0, 1.0 / 15.0, 1.0]
-            * )
-            */
-            *coeff = malloc(49 * sizeof(real));
             *len_weights = 8;
-            *weights = malloc(*len_weights * sizeof(real));
-            *weights_test = malloc(8 * sizeof(real));
-            if (!*coeff || !*weights || !*weights_test)
-            {
-                goto error_memory;
-            }
-            memcpy(
-                *coeff,
-                (real [49]) {
-                    1.0L / 6.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    4.0L / 75.0L, 16.0L / 75.0L, 0.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    5.0L / 6.0L, -8.0L / 3.0L, 5.0L / 2.0L, 0.0L, 0.0L, 0.0L, 0.0L,
-                    -165.0L / 64.0L, 55.0L / 6.0L, -425.0L / 64.0L, 85.0L / 96.0L, 0.0L, 0.0L, 0.0L,
-                    12.0L / 5.0L, -8.0L, 4015.0L / 612.0L, -11.0L / 36.0L, 88.0L / 255.0L, 0.0L, 0.0L,
-                    -8263.0L / 15000.0L, 124.0L / 75.0L, -643.0L / 680.0L, -81.0L / 250.0L, 2484.0L / 10625.0L, 0.0L, 0.0L,
-                    3501.0L / 1720.0L, -300.0L / 43.0L, 297275.0L / 52632.0L, -319.0L / 2322.0L, 24068.0L / 84065.0L, 0.0L, 3850.0L / 26703.0L
-                },
-                49 * sizeof(real)
-            );
-            memcpy(
-                *weights,
-                (real [8]) {
-                    3.0L / 40.0L, 0.0L, 875.0L / 2244.0L, 23.0L / 72.0L, 264.0L / 1955.0L, 0.0L, 125.0L / 11592.0L, 43.0L / 616.0L
-                },
-                8 * sizeof(real)
-            );
-            memcpy(
-                *weights_test,
-                (real [8]) {
-                    13.0L / 160.0L, 0.0L, 2375.0L / 5984.0L, 5.0L / 16.0L, 12.0L / 85.0L, 3.0L / 44.0L, 0.0L, 0.0L
-                },
-                8 * sizeof(real)
-            );
-
-            break;
+            *coeff = DVERK_COEFF;
+            *weights = DVERK_WEIGHTS;
+            *weights_test = DVERK_WEIGHTS_TEST;
+            return SUCCESS;
 
         default:
-            return_code = ERROR_RK_EMBEDDED_BUTCHER_TABLEAUS_UNKNOWN_ORDER;
-            goto error_code;
+            return ERROR_RK_EMBEDDED_BUTCHER_TABLEAUS_UNKNOWN_ORDER;
     }
-
-    return SUCCESS;
-
-error_memory:
-    free(*coeff);
-    free(*weights);
-    free(*weights_test);
-error_code:
-    return return_code;
 }
 
 /**
@@ -528,10 +450,10 @@ WIN32DLL_API int rk_embedded(
     int order;
     int power;
     int power_test;
-    real *coeff = NULL;
+    const real *coeff;
     int len_weights;
-    real *weights = NULL;
-    real *weights_test = NULL;
+    const real *weights;
+    const real *weights_test;
 
     return_code = get_rk_embedded_order(
         integrator_param->integrator,
@@ -571,14 +493,36 @@ WIN32DLL_API int rk_embedded(
         error_estimation_delta_weights[stage] = weights[stage] - weights_test[stage];
     }
 
-    /* tolerance */
-    real abs_tolerance = integrator_param->tolerance;
-    real rel_tolerance = integrator_param->tolerance;
+    /*
+     * First Same As Last (FSAL): if the last stage is evaluated with the
+     * weights of the solution (e.g. Dormand-Prince), its acceleration is
+     * the acceleration at the start of the next step, so it is reused
+     * instead of being computed again after an accepted step
+     */
+    bool is_fsal = (weights[stages - 1] == 0.0);
+    for (int j = 0; j < stages - 1; j++)
+    {
+        if (coeff[(stages - 2) * (stages - 1) + j] != weights[j])
+        {
+            is_fsal = false;
+        }
+    }
+
+    /*
+     * tolerance
+     * A single tolerance is exposed for all adaptive integrators, so it
+     * is used as both the absolute and the relative tolerance, i.e.
+     * tolerance_scale = tol * (1 + |x|). The relative part cannot be
+     * zero, since the tolerance is validated to be positive.
+     */
+    const real abs_tolerance = integrator_param->tolerance;
+    const real rel_tolerance = integrator_param->tolerance;
 
     /* Safety factors for step-size control */
     real safety_fac_max = 6.0;
     real safety_fac_min = 0.33;
-    real safety_fac = pow(0.38, (1.0 / (1.0 + (real) min_power)));
+    const real error_exponent = 1.0 / (1.0 + (real) min_power);
+    real safety_fac = pow(0.38, error_exponent);
 
     /* Allocate memory and declare variables */
     real *restrict x = system->x;
@@ -607,12 +551,11 @@ WIN32DLL_API int rk_embedded(
     real *restrict x_1 = malloc(objects_count * 3 * sizeof(real));
     real *restrict vk = malloc(stages * objects_count * 3 * sizeof(real));
     real *restrict xk = malloc(stages * objects_count * 3 * sizeof(real));    
-    real *restrict temp_v = malloc(objects_count * 3 * sizeof(real));
     real *restrict temp_x = malloc(objects_count * 3 * sizeof(real));
-    real *restrict error_estimation_delta_v = malloc(objects_count * 3 * sizeof(real));
-    real *restrict error_estimation_delta_x = malloc(objects_count * 3 * sizeof(real));
-    real *restrict tolerance_scale_v = malloc(objects_count * 3 * sizeof(real));
-    real *restrict tolerance_scale_x = malloc(objects_count * 3 * sizeof(real));
+
+    // Indices of the nonzero coefficients for each stage
+    int *restrict coeff_nonzero_idx = malloc((stages - 1) * (stages - 1) * sizeof(int));
+    int *restrict coeff_nonzero_count = malloc((stages - 1) * sizeof(int));
 
     // Compensated summation
     real *restrict x_err_comp_sum = calloc(objects_count * 3, sizeof(real));
@@ -625,12 +568,9 @@ WIN32DLL_API int rk_embedded(
         !x_1 || 
         !vk || 
         !xk ||  
-        !temp_v || 
         !temp_x || 
-        !error_estimation_delta_v || 
-        !error_estimation_delta_x || 
-        !tolerance_scale_v || 
-        !tolerance_scale_x || 
+        !coeff_nonzero_idx ||
+        !coeff_nonzero_count ||
         !x_err_comp_sum || 
         !v_err_comp_sum || 
         !temp_x_err_comp_sum || 
@@ -641,6 +581,27 @@ WIN32DLL_API int rk_embedded(
         goto error_memory;
     }
 
+    /*
+     * Many coefficients of the Butcher tableaus are zero, especially
+     * for RKF78. The nonzero ones are found once here, so that the
+     * stage sums in the main loop only go through those terms.
+     */
+    for (int stage = 1; stage < stages; stage++)
+    {
+        const real *restrict coeff_stage = &coeff[(stage - 1) * (stages - 1)];
+        int *restrict nonzero_idx = &coeff_nonzero_idx[(stage - 1) * (stages - 1)];
+        int nonzero_count = 0;
+        for (int j = 0; j < stage; j++)
+        {
+            if (coeff_stage[j] != 0.0)
+            {
+                nonzero_idx[nonzero_count] = j;
+                nonzero_count++;
+            }
+        }
+        coeff_nonzero_count[stage - 1] = nonzero_count;
+    }
+
     /* Get initial dt */
     if (integrator_param->initial_dt > 0.0)
     {
@@ -666,55 +627,66 @@ WIN32DLL_API int rk_embedded(
     int64 count = 1; // Count for storing solutions, 1 for t_0
     int storing_freq = storing_param->storing_freq;
 
+    /*
+     * The first stage only depends on x and v, so it is kept when a
+     * step is rejected, and only recomputed after the step is accepted
+     */
+    bool is_first_stage_valid = false;
+
     while (*t < tf)
     {
         /* Compute xk and vk */
-        return_code = acceleration(
-            vk,
-            system,
-            acceleration_param
-        );
-        if (return_code != SUCCESS)
-        {
-            goto acc_error;
-        }
-        memcpy(xk, v, objects_count * 3 * sizeof(real));
-        for (int stage = 1; stage < stages; stage++)
+        if (!is_first_stage_valid)
         {
-            // Empty temp_v and temp_x
-            for (int i = 0; i < objects_count; i++)
-            {
-                temp_v[i * 3 + 0] = 0.0;
-                temp_v[i * 3 + 1] = 0.0;
-                temp_v[i * 3 + 2] = 0.0;
-                temp_x[i * 3 + 0] = 0.0;
-                temp_x[i * 3 + 1] = 0.0;
-                temp_x[i * 3 + 2] = 0.0;
-            }
-
-            for (int i = 0; i < stage; i++)
+            return_code = acceleration(
+                vk,
+                system,
+                acceleration_param
+            );
+            if (return_code != SUCCESS)
             {
-                for (int j = 0; j < objects_count; j++)
-                {
-                    for (int k = 0; k < 3; k++)
-                    {
-                        temp_v[j * 3 + k] += coeff[(stage - 1) * (stages - 1) + i] * vk[i * objects_count * 3 + j * 3 + k];
-                        temp_x[j * 3 + k] += coeff[(stage - 1) * (stages - 1) + i] * xk[i * objects_count * 3 + j * 3 + k];
-                    }
-                }
+                goto acc_error;
             }
+            memcpy(xk, v, objects_count * 3 * sizeof(real));
+            is_first_stage_valid = true;
+        }
 
-            for (int i = 0; i < objects_count; i++)
+        for (int stage = 1; stage < stages; stage++)
+        {
+            /*
+             * The weighted sums over the previous stages are accumulated
+             * in scalars for each component and written to temp_x and
+             * stage_v once, instead of zeroing and updating whole arrays
+             * for every stage. The velocity of the stage is also the
+             * derivative of x at this stage, so it is written directly
+             * to its slot in xk instead of being copied there afterwards.
+             */
+            const real *restrict coeff_stage = &coeff[(stage - 1) * (stages - 1)];
+            const int *restrict nonzero_idx = &coeff_nonzero_idx[(stage - 1) * (stages - 1)];
+            const int nonzero_count = coeff_nonzero_count[stage - 1];
+            real *stage_v = &xk[stage * objects_count * 3];
+
+            // The components are independent, so the loop is run in
+            // parallel when compiled with OpenMP, for large systems only
+#ifdef _OPENMP
+            #pragma omp parallel for schedule(static) if(objects_count >= 256)
+#endif
+            for (int i = 0; i < objects_count * 3; i++)
             {
-                for (int j = 0; j < 3; j++)
+                real sum_v = 0.0;
+                real sum_x = 0.0;
+                for (int n = 0; n < nonzero_count; n++)
                 {
-                    temp_v[i * 3 + j] = v[i * 3 + j] + dt * temp_v[i * 3 + j] + v_err_comp_sum[i * 3 + j];
-                    temp_x[i * 3 + j] = x[i * 3 + j] + dt * temp_x[i * 3 + j] + x_err_comp_sum[i * 3 + j];
+                    const int j = nonzero_idx[n];
+                    sum_v += coeff_stage[j] * vk[j * objects_count * 3 + i];
+                    sum_x += coeff_stage[j] * xk[j * objects_count * 3 + i];
                 }
+                stage_v[i] = v[i] + dt * sum_v + v_err_comp_sum[i];
+                temp_x[i] = x[i] + dt * sum_x + x_err_comp_sum[i];
             }
 
             temp_system.x = temp_x;
-            temp_system.v = temp_v;
+            temp_system.v = stage_v;
             return_code = acceleration(
                 &vk[stage * objects_count * 3],
                 &temp_system,
@@ -724,82 +696,56 @@ WIN32DLL_API int rk_embedded(
             {
                 goto acc_error;
             }
-            memcpy(&xk[stage * objects_count * 3], temp_v, objects_count * 3 * sizeof(real));
         }
 
-        // Empty temp_v, temp_x, error_estimation_delta_v, error_estimation_delta_x
-        for (int i = 0; i < objects_count; i++)
-        {
-            temp_v[i * 3 + 0] = 0.0;
-            temp_v[i * 3 + 1] = 0.0;
-            temp_v[i * 3 + 2] = 0.0;
-            temp_x[i * 3 + 0] = 0.0;
-            temp_x[i * 3 + 1] = 0.0;
-            temp_x[i * 3 + 2] = 0.0;
-            error_estimation_delta_v[i * 3 + 0] = 0.0;
-            error_estimation_delta_v[i * 3 + 1] = 0.0;
-            error_estimation_delta_v[i * 3 + 2] = 0.0;
-            error_estimation_delta_x[i * 3 + 0] = 0.0;
-            error_estimation_delta_x[i * 3 + 1] = 0.0;
-            error_estimation_delta_x[i * 3 + 2] = 0.0;
-        }
-
-        // Calculate x_1, v_1 and also delta x, delta v for error estimation
-        for(int stage = 0; stage < stages; stage++)
+        /*
+         * Calculate x_1, v_1 with compensated summation, together with
+         * the error estimation. Each component is computed in a single
+         * pass over the stages, and its contribution to the error norm
+         * is added immediately, so no temporary arrays are needed for
+         * the error estimation and the tolerance scales.
+         *
+         * As with the stage sums, the loop is run in parallel for large
+         * systems when compiled with OpenMP, with the error norm summed
+         * by reduction.
+         */
+        sum = 0.0;
+#ifdef _OPENMP
+        #pragma omp parallel for schedule(static) reduction(+:sum) if(objects_count >= 256)
+#endif
+        for (int i = 0; i < objects_count * 3; i++)
         {
-            for (int i = 0; i < objects_count; i++)
+            real sum_v = 0.0;
+            real sum_x = 0.0;
+            real error_estimation_delta_v = 0.0;
+            real error_estimation_delta_x = 0.0;
+            for (int stage = 0; stage < stages; stage++)
             {
-                for (int j = 0; j < 3; j++)
-                {
-                    temp_v[i * 3 + j] += weights[stage] * vk[stage * objects_count * 3 + i * 3 + j];
-                    temp_x[i * 3 + j] += weights[stage] * xk[stage * objects_count * 3 + i * 3 + j];
-
-                    error_estimation_delta_v[i * 3 + j] += dt * error_estimation_delta_weights[stage] * vk[stage * objects_count * 3 + i * 3 + j];
-                    error_estimation_delta_x[i * 3 + j] += dt * error_estimation_delta_weights[stage] * xk[stage * objects_count * 3 + i * 3 + j];
-                }
+                const real vk_i = vk[stage * objects_count * 3 + i];
+                const real xk_i = xk[stage * objects_count * 3 + i];
+                sum_v += weights[stage] * vk_i;
+                sum_x += weights[stage] * xk_i;
+                error_estimation_delta_v += dt * error_estimation_delta_weights[stage] * vk_i;
+                error_estimation_delta_x += dt * error_estimation_delta_weights[stage] * xk_i;
             }
-        }
 
-        memcpy(temp_x_err_comp_sum, x_err_comp_sum, objects_count * 3 * sizeof(real));
-        memcpy(temp_v_err_comp_sum, v_err_comp_sum, objects_count * 3 * sizeof(real));
-        for (int i = 0; i < objects_count; i++)
-        {
-            for (int j = 0; j < 3; j++)
-            {
-                temp_v_err_comp_sum[i * 3 + j] += dt * temp_v[i * 3 + j];
-                temp_x_err_comp_sum[i * 3 + j] += dt * temp_x[i * 3 + j];
+            temp_v_err_comp_sum[i] = v_err_comp_sum[i] + dt * sum_v;
+            temp_x_err_comp_sum[i] = x_err_comp_sum[i] + dt * sum_x;
 
-                v_1[i * 3 + j] = v[i * 3 + j] + temp_v_err_comp_sum[i * 3 + j];
-                x_1[i * 3 + j] = x[i * 3 + j] + temp_x_err_comp_sum[i * 3 + j];
+            v_1[i] = v[i] + temp_v_err_comp_sum[i];
+            x_1[i] = x[i] + temp_x_err_comp_sum[i];
 
-                temp_v_err_comp_sum[i * 3 + j] += v[i * 3 + j] - v_1[i * 3 + j];
-                temp_x_err_comp_sum[i * 3 + j] += x[i * 3 + j] - x_1[i * 3 + j];
-            }
-        }
+            temp_v_err_comp_sum[i] += v[i] - v_1[i];
+            temp_x_err_comp_sum[i] += x[i] - x_1[i];
 
-        /* Error calculation */
-        for (int i = 0; i < objects_count; i++)
-        {
-            for (int j = 0; j < 3; j++)
-            {
-                tolerance_scale_v[i * 3 + j] = abs_tolerance + fmax(fabs(v[i * 3 + j]), fabs(v_1[i * 3 + j])) * rel_tolerance;
-                tolerance_scale_x[i * 3 + j] = abs_tolerance + fmax(fabs(x[i * 3 + j]), fabs(x_1[i * 3 + j])) * rel_tolerance;
-            }
-        }
-
-        // Sum up all the elements of x/tol and v/tol, 
-        // square and divide by the total number of elements
-        sum = 0.0;
-        for (int i = 0; i < objects_count; i++)
-        {
+            // Sum up the squares of delta_v / tol and delta_x / tol
+            const real tolerance_scale_v = abs_tolerance + fmax(fabs(v[i]), fabs(v_1[i])) * rel_tolerance;
+            const real tolerance_scale_x = abs_tolerance + fmax(fabs(x[i]), fabs(x_1[i])) * rel_tolerance;
             real temp;
-            for (int j = 0; j < 3; j++)
-            {
-                temp = error_estimation_delta_v[i * 3 + j] / tolerance_scale_v[i * 3 + j];
-                sum += temp * temp;
-                temp = error_estimation_delta_x[i * 3 + j] / tolerance_scale_x[i * 3 + j];
-                sum += temp * temp;
-            }
+            temp = error_estimation_delta_v / tolerance_scale_v;
+            sum += temp * temp;
+            temp = error_estimation_delta_x / tolerance_scale_x;
+            sum += temp * temp;
         }
         error = sqrt(sum / (objects_count * 3 * 2));
 
@@ -812,6 +758,15 @@ WIN32DLL_API int rk_embedded(
 
             memcpy(x_err_comp_sum, temp_x_err_comp_sum, objects_count * 3 * sizeof(real));
             memcpy(v_err_comp_sum, temp_v_err_comp_sum, objects_count * 3 * sizeof(real));
+            if (is_fsal)
+            {
+                memcpy(vk, &vk[(stages - 1) * objects_count * 3], objects_count * 3 * sizeof(real));
+                memcpy(xk, v, objects_count * 3 * sizeof(real));
+            }
+            else
+            {
+                is_first_stage_valid = false;
+            }
 
             /* Store solution */
             if (count % storing_freq == 0)
@@ -840,6 +795,7 @@ WIN32DLL_API int rk_embedded(
                     goto err_store_solution;
                 }
             }
+            count++;
         }
 
         /* Calculate dt for next step */
@@ -847,7 +803,7 @@ WIN32DLL_API int rk_embedded(
         {
             error = 1e-10;  // Prevent error from being too small
         }
-        dt_new = dt * safety_fac / pow(error, (1.0 / (1.0 + (real) min_power)));
+        dt_new = dt * safety_fac / pow(error, error_exponent);
         if (dt_new > safety_fac_max * dt) 
         {
             dt *= safety_fac_max;
@@ -886,20 +842,14 @@ WIN32DLL_API int rk_embedded(
     free(x_1);
     free(vk);
     free(xk);
-    free(temp_v);
     free(temp_x);
-    free(error_estimation_delta_v);
-    free(error_estimation_delta_x);
-    free(tolerance_scale_v);
-    free(tolerance_scale_x);
+    free(coeff_nonzero_idx);
+    free(coeff_nonzero_count);
     free(x_err_comp_sum);
     free(v_err_comp_sum);
     free(temp_x_err_comp_sum);
     free(temp_v_err_comp_sum);
     free(error_estimation_delta_weights);
-    free(coeff);
-    free(weights);
-    free(weights_test); 
 
     return SUCCESS;
 
@@ -912,12 +862,9 @@ error_memory:
     free(x_1);
     free(vk);
     free(xk);
-    free(temp_v);
     free(temp_x);
-    free(error_estimation_delta_v);
-    free(error_estimation_delta_x);
-    free(tolerance_scale_v);
-    free(tolerance_scale_x);
+    free(coeff_nonzero_idx);
+    free(coeff_nonzero_count);
     free(x_err_comp_sum);
     free(v_err_comp_sum);
     free(temp_x_err_comp_sum);
@@ -849,17 +849,21 @@ IN_FILE int whfast_acceleration_massless(
         }
     }
 
-    /* Find the indices of massive and massless objects */
-    int *restrict massive_indices = malloc(massive_objects_count * sizeof(int));
-    int *restrict massless_indices = malloc(massless_objects_count * sizeof(int));
-    massive_objects_count = 0;
-    massless_objects_count = 0;
-
-    if (!massive_indices || !massless_indices)
+    /*
+     * Find the indices of massive and massless objects. Both lists
+     * share one allocation, with the massless indices stored after
+     * the massive ones, so that only one buffer is allocated per call
+     */
+    int *restrict indices = malloc(objects_count * sizeof(int));
+    if (!indices)
     {
         return_code = ERROR_WHFAST_ACC_MASSLESS_MEMORY_ALLOC;
         goto err_memory;
     }
+    int *restrict massive_indices = indices;
+    int *restrict massless_indices = indices + massive_objects_count;
+    massive_objects_count = 0;
+    massless_objects_count = 0;
 
     for (int i = 0; i < objects_count; i++)
     {
@@ -1097,13 +1101,10 @@ IN_FILE int whfast_acceleration_massless(
         aux[2] = 0.0;
     }
 
-    free(massive_indices);
-    free(massless_indices);
+    free(indices);
 
     return SUCCESS;
 
 err_memory:
-    free(massive_indices);
-    free(massless_indices);
     return return_code;
 }
@@ -214,42 +214,49 @@ WIN32DLL_API int extend_sol_memory_buffer(
     const int objects_count
 )
 {
-    int return_code;
-
-    int64 buffer_size = storing_param->max_sol_size_ * 2;
-    double *restrict temp_sol_state = NULL;
-    double *restrict temp_sol_time = NULL;
-    double *restrict temp_sol_dt = NULL;
+    /*
+     * The capacity is doubled, so that the total cost of growing the
+     * buffers is O(N) in the number of stored time steps. Each
+     * successful realloc is assigned back immediately, so the solutions
+     * always hold valid buffers of at least the old capacity, even if
+     * a later realloc fails. The buffers are freed by the caller.
+     */
+    const int64 buffer_size = storing_param->max_sol_size_ * 2;
 
-    temp_sol_state = realloc(
+    double *temp_sol_state = realloc(
         solutions->sol_state,
         buffer_size * objects_count * 6 * sizeof(double)
     );
-    temp_sol_time = realloc(
+    if (!temp_sol_state)
+    {
+        goto error_memory;
+    }
+    solutions->sol_state = temp_sol_state;
+
+    double *temp_sol_time = realloc(
         solutions->sol_time,
         buffer_size * sizeof(double)
     );
-    temp_sol_dt = realloc(
+    if (!temp_sol_time)
+    {
+        goto error_memory;
+    }
+    solutions->sol_time = temp_sol_time;
+
+    double *temp_sol_dt = realloc(
         solutions->sol_dt,
         buffer_size * sizeof(double)
     );
-
-    if (!temp_sol_state || !temp_sol_time || !temp_sol_dt)
+    if (!temp_sol_dt)
     {
-        return_code = ERROR_SOL_OUTPUT_EXTEND_MEMORY_REALLOC;
         goto error_memory;
     }
+    solutions->sol_dt = temp_sol_dt;
 
     storing_param->max_sol_size_ = buffer_size;
-    solutions->sol_state = temp_sol_state;
-    solutions->sol_time = temp_sol_time;
-    solutions->sol_dt = temp_sol_dt;
 
     return SUCCESS;
 
 error_memory:
-    free(temp_sol_state);
-    free(temp_sol_time);
-    free(temp_sol_dt);
-    return return_code;
+    return ERROR_SOL_OUTPUT_EXTEND_MEMORY_REALLOC;
 }
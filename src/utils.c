@@ -3,6 +3,7 @@
  * \brief Definitions of utility functions
  * \author Ching Yin Ng
  */
+#include <math.h>
 #include <stdlib.h>
 
 #include "gravity_sim.h"
@@ -25,32 +26,101 @@ WIN32DLL_API int compute_energy_step(
     const real G = system->G;
     const int objects_count = system->objects_count;
 
-    *energy = 0.0;
-
+    /*
+     * Same as compute_energy_state: the factors 0.5, G and m_i are
+     * applied once to the sums instead of to every term, and the pair
+     * distances are computed inline with a single sqrt
+     */
+    real kinetic_sum = 0.0;
+    real potential_sum = 0.0;
     for (int i = 0; i < objects_count; i++)
     {
-        // KE
-        real v_norm = vec_norm_3d(&v[i * 3]);
-        *energy += (
-            0.5 * m[i] 
-            * v_norm * v_norm
-        );
+        // Massless objects add nothing to either sum (see compute_energy_state)
+        if (m[i] == 0.0)
+        {
+            continue;
+        }
+
+        // KE (squared speed, no need to take the square root)
+        const real *restrict v_i = &v[i * 3];
+        kinetic_sum += m[i] * (v_i[0] * v_i[0] + v_i[1] * v_i[1] + v_i[2] * v_i[2]);
 
         // PE
+        const real *restrict x_i = &x[i * 3];
+        real potential_sum_i = 0.0;
         for (int j = i + 1; j < objects_count; j++)
         {
-            real r_ij[3];
-            for (int k = 0; k < 3; k++)
-            {
-                r_ij[k] = (x[i * 3 + k] - x[j * 3 + k]);
-            }
-            *energy -= (G * m[i] * m[j] / vec_norm_3d(r_ij));
+            const real r_ij_x = x_i[0] - x[j * 3 + 0];
+            const real r_ij_y = x_i[1] - x[j * 3 + 1];
+            const real r_ij_z = x_i[2] - x[j * 3 + 2];
+            const real r_ij_norm_sq = r_ij_x * r_ij_x + r_ij_y * r_ij_y + r_ij_z * r_ij_z;
+            potential_sum_i += m[j] / sqrt(r_ij_norm_sq);
         }
+        potential_sum += m[i] * potential_sum_i;
     }
+    *energy = 0.5 * kinetic_sum - G * potential_sum;
     
     return SUCCESS;
 }
 
+/**
+ * \brief Compute the energy of a single row of the solution state
+ * 
+ * \param objects_count Number of objects in the system
+ * \param m Pointer to the mass array
+ * \param G Gravitational constant
+ * \param state Pointer to the row of the solution state
+ * 
+ * \return Energy of the system at the time step
+ */
+IN_FILE real compute_energy_state(
+    const int objects_count,
+    const double *restrict m,
+    const real G,
+    const double *restrict state
+)
+{
+    /*
+     * The constant factors 0.5 and G are applied once to the sums,
+     * and m_i once per object, instead of for every term of the sums
+     */
+    real kinetic_sum = 0.0;
+    real potential_sum = 0.0;
+    for (int i = 0; i < objects_count; i++)
+    {
+        /*
+         * Massless objects add nothing to either sum, so they are
+         * skipped as the outer object of the pairs. With many massless
+         * objects (e.g. asteroids), this reduces the cost from O(N^2)
+         * to O(N * N_massive) without changing the result.
+         */
+        if (m[i] == 0.0)
+        {
+            continue;
+        }
+
+        // KE (squared speed, no need to take the square root)
+        const real *restrict v_i = &state[(objects_count + i) * 3];
+        kinetic_sum += m[i] * (v_i[0] * v_i[0] + v_i[1] * v_i[1] + v_i[2] * v_i[2]);
+
+        // PE (the squared distance is computed inline, followed by a
+        // single sqrt, instead of calling vec_norm_3d for every pair)
+        const real *restrict x_i = &state[i * 3];
+        real potential_sum_i = 0.0;
+        for (int j = i + 1; j < objects_count; j++)
+        {
+            const real r_ij_x = x_i[0] - state[j * 3 + 0];
+            const real r_ij_y = x_i[1] - state[j * 3 + 1];
+            const real r_ij_z = x_i[2] - state[j * 3 + 2];
+            const real r_ij_norm_sq = r_ij_x * r_ij_x + r_ij_y * r_ij_y + r_ij_z * r_ij_z;
+            potential_sum_i += m[j] / sqrt(r_ij_norm_sq);
+        }
+        potential_sum += m[i] * potential_sum_i;
+    }
+
+    return 0.5 * kinetic_sum - G * potential_sum;
+}
+
 WIN32DLL_API void compute_energy_python(
     const int objects_count,
     const double *restrict m,
@@ -59,38 +129,31 @@ WIN32DLL_API void compute_energy_python(
     int *restrict count,
     real *restrict energy,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 )
 {
+    /*
+     * The time steps are independent of each other, so they are
+     * processed in blocks that can be shared between threads when
+     * compiled with OpenMP. The progress counter and the exit flag
+     * are updated and checked between blocks.
+     */
+    const int block_size = 1024;
     while (*count < npts)
-    {   
-        for (int i = 0; i < objects_count; i++)
+    {
+        const int block_start = *count;
+        const int block_end = (
+            (npts - block_start > block_size) ? block_start + block_size : npts
+        );
+
+#ifdef _OPENMP
+        #pragma omp parallel for schedule(static)
+#endif
+        for (int step = block_start; step < block_end; step++)
         {
-            // KE
-            real v_norm = vec_norm_3d(&sol_state[*count][(objects_count + i) * 3]);
-            energy[*count] += (
-                0.5 * m[i] 
-                * v_norm * v_norm
-            );
-
-            // PE
-            for (int j = i + 1; j < objects_count; j++)
-            {
-                real r_ij[3];
-                for (int k = 0; k < 3; k++)
-                {
-                    r_ij[k] = (
-                        sol_state[*count][i * 3 + k]
-                        - sol_state[*count][j * 3 + k]
-                    );
-                }
-                energy[*count] -= (
-                    G * m[i] * m[j]
-                    / vec_norm_3d(r_ij)
-                );
-            }
+            energy[step] = compute_energy_state(objects_count, m, G, sol_state[step]);
         }
-        *count += 1;
+        *count = block_end;
 
         // Check if user sends KeyboardInterrupt in main thread
         if (*is_exit)
@@ -107,21 +170,34 @@ WIN32DLL_API void compute_linear_momentum_python(
     int *restrict count,
     double *restrict linear_momentum,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 )
 {
+    // Processed in blocks of time steps, as in compute_energy_python
+    const int block_size = 1024;
     while (*count < npts)
     {
-        real linear_momentum_vec_step[3] = {0.0};
-        for (int i = 0; i < objects_count; i++)
+        const int block_start = *count;
+        const int block_end = (
+            (npts - block_start > block_size) ? block_start + block_size : npts
+        );
+
+#ifdef _OPENMP
+        #pragma omp parallel for schedule(static)
+#endif
+        for (int step = block_start; step < block_end; step++)
         {
-            for (int j = 0; j < 3; j++)
+            real linear_momentum_vec_step[3] = {0.0};
+            for (int i = 0; i < objects_count; i++)
             {
-                linear_momentum_vec_step[j] += m[i] * (sol_state[*count][(objects_count + i) * 3 + j]);
+                for (int j = 0; j < 3; j++)
+                {
+                    linear_momentum_vec_step[j] += m[i] * (sol_state[step][(objects_count + i) * 3 + j]);
+                }
             }
+            linear_momentum[step] = vec_norm_3d(linear_momentum_vec_step);
         }
-        linear_momentum[*count] = vec_norm_3d(linear_momentum_vec_step);
-        *count += 1;
+        *count = block_end;
 
         // Check if user sends KeyboardInterrupt in main thread
         if (*is_exit)
@@ -138,36 +214,50 @@ WIN32DLL_API void compute_angular_momentum_python(
     int *restrict count,
     double *restrict angular_momentum,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 )
 {
+    // Processed in blocks of time steps, as in compute_energy_python
+    const int block_size = 1024;
     while (*count < npts)
     {
-        real angular_momentum_vec_step[3] = {0.0};
-        // L = m * r x v
-        for (int i = 0; i < objects_count; i++)
+        const int block_start = *count;
+        const int block_end = (
+            (npts - block_start > block_size) ? block_start + block_size : npts
+        );
+
+#ifdef _OPENMP
+        #pragma omp parallel for schedule(static)
+#endif
+        for (int step = block_start; step < block_end; step++)
         {
-            angular_momentum_vec_step[0] += m[i] * (
-                sol_state[*count][i * 3 + 1] 
-                * sol_state[*count][(objects_count + i) * 3 + 2]
-                - sol_state[*count][i * 3 + 2] 
-                * sol_state[*count][(objects_count + i) * 3 + 1]
-            );
-            angular_momentum_vec_step[1] += m[i] * (
-                sol_state[*count][i * 3 + 2]
-                * sol_state[*count][(objects_count + i) * 3 + 0]
-                - sol_state[*count][i * 3 + 0]
-                * sol_state[*count][(objects_count + i) * 3 + 2]
-            );
-            angular_momentum_vec_step[2] += m[i] * (
-                sol_state[*count][i * 3]
-                * sol_state[*count][(objects_count + i) * 3 + 1]
-                - sol_state[*count][i * 3 + 1]
-                * sol_state[*count][(objects_count + i) * 3]
-            );
+            const double *restrict state = sol_state[step];
+            real angular_momentum_vec_step[3] = {0.0};
+            // L = m * r x v
+            for (int i = 0; i < objects_count; i++)
+            {
+                angular_momentum_vec_step[0] += m[i] * (
+                    state[i * 3 + 1] 
+                    * state[(objects_count + i) * 3 + 2]
+                    - state[i * 3 + 2] 
+                    * state[(objects_count + i) * 3 + 1]
+                );
+                angular_momentum_vec_step[1] += m[i] * (
+                    state[i * 3 + 2]
+                    * state[(objects_count + i) * 3 + 0]
+                    - state[i * 3 + 0]
+                    * state[(objects_count + i) * 3 + 2]
+                );
+                angular_momentum_vec_step[2] += m[i] * (
+                    state[i * 3]
+                    * state[(objects_count + i) * 3 + 1]
+                    - state[i * 3 + 1]
+                    * state[(objects_count + i) * 3]
+                );
+            }
+            angular_momentum[step] = vec_norm_3d(angular_momentum_vec_step);
         }
-        angular_momentum[*count] = vec_norm_3d(angular_momentum_vec_step);
-        *count += 1;
+        *count = block_end;
 
         // Check if user sends KeyboardInterrupt in main thread
         if (*is_exit)
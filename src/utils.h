@@ -49,7 +49,7 @@ void compute_energy_python(
     int *restrict count,
     real *restrict energy,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 );
 
 /**
@@ -70,7 +70,7 @@ void compute_linear_momentum_python(
     int *restrict count,
     double *restrict linear_momentum,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 );
 
 /**
@@ -91,7 +91,7 @@ void compute_angular_momentum_python(
     int *restrict count,
     double *restrict angular_momentum,
     const double (*restrict sol_state)[objects_count * 6],
-    int *restrict is_exit
+    bool *restrict is_exit
 );
 
 #endif